@@ -63,7 +63,6 @@ def testAndDelete(fc):
 def unique_values(table, field):
     with arcpy.da.SearchCursor(table, field) as cursor:
         return sorted({row[0] for row in cursor})
-    del row, cursor
 
 def round2int(x,base):
     return base * round(x/base)
@@ -115,7 +114,8 @@ def locateEvents_Table(pts, sel_dist, event_props, z_type, is_lines=False):
         arcpy.ddd.AddSurfacInformation(pts, dem, z_type, "LINEAR")
 
     dupDetectField = "xDupDetect"
-    arcpy.management.AddField(pts, dupDetectField, "LONG")
+    if not arcpy.ListFields(pts, dupDetectField):
+        arcpy.management.AddField(pts, dupDetectField, "LONG")
     eventLocTable = os.path.join(scratchDir, "XSEC_{}_bhEvents".format(Value))
     testAndDelete(eventLocTable)
     arcpy.lr.LocateFeaturesAlongRoutes(pts,zm_line,checkField,sel_dist,eventLocTable,event_props)
@@ -146,57 +146,31 @@ def boreholes(locatedPoints):
     elevID = tRows.fields.index(zField)
     depthID = tRows.fields.index("BOREH_DEPTH")
 
+    ang_i = tRows.fields.index("LOC_ANGLE")
+    azi_i = tRows.fields.index("LocalXSEC_Azimuth")
+    dfs_i = tRows.fields.index("DistFromSection")
+    dist_i = tRows.fields.index("Distance")
+    factor = 0.3048 if elevUnits == "Feet" else 1.0
+    ve_f = float(ve)
+
     i = 0
     for row in tRows:
-        if elevUnits == "Meters":
-            i = i + 1
-            geom = row[-1]
-            existPnt = geom[0]
-            bhArray = []
-            X = existPnt.M
-            Ytop = float(row[elevID])
-            Ybot = Ytop - float(row[depthID])
-            bhArray.append((X, Ytop * float(ve)))
-            bhArray.append((X, Ybot * float(ve)))
-            vals = list(row).copy()
-            vals.append("")
-            vals[-2] = bhArray
-            csAzi = cartesianToGeographic(angle=row[tRows.fields.index("LOC_ANGLE")])
-            vals[tRows.fields.index("LocalXSEC_Azimuth")] = csAzi
-            vals[tRows.fields.index("DistFromSection")] = row[tRows.fields.index("Distance")]
-            vals[-1] = "{}{}".format(id_pref, i)
-            try:
-                cur.insertRow(vals)
-                bhArray.clear()
-            except Exception as e:
-                AddMsgAndPrint("Could not create feature from objectid {} in {}".format(row[oid_i], locPoints), 1)
-                AddMsgAndPrint(e)
-        if elevUnits == "Feet":
-            i = i + 1
-            geom = row[-1]
-            existPnt = geom[0]
-            bhArray = []
-            X = existPnt.M
-            Ytop = float(row[elevID]) * 0.3048
-            Ybot = Ytop - (float(row[depthID]) * 0.3048)
-            bhArray.append((X, Ytop * float(ve)))
-            bhArray.append((X, Ybot * float(ve)))
-            vals = list(row).copy()
-            vals.append("")
-            vals[-2] = bhArray
-            csAzi = cartesianToGeographic(angle=row[tRows.fields.index("LOC_ANGLE")])
-            vals[tRows.fields.index("LocalXSEC_Azimuth")] = csAzi
-            vals[tRows.fields.index("DistFromSection")] = row[tRows.fields.index("Distance")]
-            vals[-1] = "{}{}".format(id_pref, i)
-            try:
-                cur.insertRow(vals)
-                bhArray.clear()
-            except Exception as e:
-                AddMsgAndPrint("Could not create feature from objectid {} in {}".format(row[oid_i],
-                                                                                        os.path.basename(
-                                                                                            locatedPoints)), 1)
-                AddMsgAndPrint(e)
-        del row
+        i = i + 1
+        X = row[-1][0].M
+        Ytop = float(row[elevID]) * factor
+        Ybot = Ytop - (float(row[depthID]) * factor)
+        vals = list(row)
+        vals.append("{}{}".format(id_pref, i))
+        vals[-2] = [(X, Ytop * ve_f), (X, Ybot * ve_f)]
+        vals[azi_i] = cartesianToGeographic(angle=row[ang_i])
+        vals[dfs_i] = row[dist_i]
+        try:
+            cur.insertRow(vals)
+        except Exception as e:
+            AddMsgAndPrint("Could not create feature from objectid {} in {}".format(row[oid_i],
+                                                                                    os.path.basename(
+                                                                                        locatedPoints)), 1)
+            AddMsgAndPrint(e)
     del tRows, cur
     return bhSticks
 def placeEvents(inRoutes, idRteFld, eventTable, eventRteFld, fromVar, toVar, eventLay):
@@ -466,6 +440,18 @@ for Value in allValue:
 
 arcpy.AddMessage('_____________________________')
 arcpy.AddMessage("BEGIN BOREHOLE CREATION")
+# Every cross-section samples the same boreholes from the same DEM, so the surface elevations are interpolated once and
+# each cross-section selects its boreholes from that copy
+try:
+    zCache = os.path.join(scratchDir, "{}_zCache".format(os.path.splitext(os.path.basename(newBhPoints))[0]))
+    arcpy.ddd.InterpolateShape(dem, newBhPoints, zCache)
+    if not arcpy.ListFields(zCache, "zDEM"):
+        arcpy.management.AddField(zCache, "zDEM", "FLOAT")
+    arcpy.management.CalculateField(zCache, "zDEM", "!SHAPE.FIRSTPOINT.Z!", "PYTHON3")
+    zField = "zDEM"
+except:
+    AddMsgAndPrint("ERROR 001: Failed to interpolate borehole elevations from {}".format(os.path.basename(dem)),2)
+    raise SystemError
 for Value in allValue:
     try:
         arcpy.AddMessage("*Analyzing {}...*".format(Value))
@@ -517,7 +503,6 @@ for Value in allValue:
                     else:
                         pass
                     cursor.updateRow(row)
-            del row, cursor
             cpDir = arcpy.SearchCursor(z_line, "", "", "", "QUAD D").next().getValue("QUAD")
             cp = getCPValue(cpDir)
             zm_line = os.path.join(scratchDir, "XSEC_{}_zm".format(Value))
@@ -528,24 +513,14 @@ for Value in allValue:
     try:
         #arcpy.SetProgressor("step","Creating borehole sticks for {}...".format(Value))
         AddMsgAndPrint("    Creating borehole sticks for {}...".format(Value))
-        boreholeNear = arcpy.management.SelectLayerByLocation(
-            in_layer=newBhPoints,
+        zBoreholes = "XSEC_{}_zBoreholes".format(Value)
+        arcpy.management.MakeFeatureLayer(zCache, zBoreholes)
+        arcpy.management.SelectLayerByLocation(
+            in_layer=zBoreholes,
             overlap_type="WITHIN_A_DISTANCE",
             select_features=zm_line,
             search_distance=buff
         )
-        zBoreholes = "XSEC_{}_zBoreholes".format(Value)
-        arcpy.ddd.InterpolateShape(dem, boreholeNear, zBoreholes)
-        try:
-            arcpy.management.AddField(zBoreholes, "zDEM", "FLOAT")
-        except:
-            pass
-        try:
-            arcpy.management.CalculateField(zBoreholes, "zDEM", "!SHAPE.FIRSTPOINT.Z!", "PYTHON3")
-        except:
-            arcpy.management.CalculateField(zBoreholes, "zDEM", 0, "PYTHON3")
-        zField = "zDEM"
-        arcpy.management.SelectLayerByAttribute(bhPoints, "CLEAR_SELECTION")
 
         rProps = "rkey POINT M fmp"
         eventTable = locateEvents_Table(pts=zBoreholes, sel_dist=buff, event_props=rProps, z_type="Z")
@@ -583,7 +558,6 @@ for Value in allValue:
         with arcpy.da.SearchCursor(bhLines, ["WELLID"]) as cursor:
             for row in cursor:
                 wellIds.append(row[0])
-            del row, cursor
         routeLiths = arcpy.management.SelectLayerByAttribute(
             in_layer_or_view=newLithTable,
             selection_type="ADD_TO_SELECTION",
@@ -623,7 +597,6 @@ for Value in allValue:
             for row in cursor:
                 if row[0] == "ROUTE NOT FOUND":
                     cursor.deleteRow()
-            del row, cursor
         arcpy.SetProgressorPosition()
         arcpy.SetProgressorLabel("Formatting fields...")
         arcpy.SetProgressorPosition()
@@ -810,6 +783,7 @@ for Value in allValue:
         AddMsgAndPrint("ERROR 006: Failed to clean up {}".format(os.path.basename(scratchDir)),2)
         raise SystemError
 
+testAndDelete(zCache)
 arcpy.AddMessage('_____________________________')
 arcpy.AddMessage("BEGIN DEM TOPOGRAPHIC SURFACE CREATION")
 featExtent = os.path.join(scratchDir, "ProjectAreaExtent_TOPO")
@@ -866,7 +840,6 @@ for Value in allValue:
                     else:
                         pass
                     cursor.updateRow(row)
-            del row, cursor
             cpDir = arcpy.SearchCursor(z_line, "", "", "", "QUAD D").next().getValue("QUAD")
             cp = getCPValue(cpDir)
             zm_line = os.path.join(scratchDir, "XSEC_{}_zm".format(Value))
@@ -1006,7 +979,6 @@ else:
                         else:
                             pass
                         cursor.updateRow(row)
-                del row, cursor
                 cpDir = arcpy.SearchCursor(z_line, "", "", "", "QUAD D").next().getValue("QUAD")
                 cp = getCPValue(cpDir)
                 zm_line = os.path.join(scratchDir, "XSEC_{}_zm".format(Value))
@@ -1101,7 +1073,6 @@ else:
                     if (row[0] == 1 and row[1] == 1):
                         row[2] = "CONFIDENT"
                         cursor.updateRow(row)
-                del row, cursor
         except:
             AddMsgAndPrint("ERROR 010: Failed to create confidence zone for {}".format(os.path.basename(bdrkDEM)),2)
             raise SystemError
@@ -1174,6 +1145,9 @@ if gwlDEM == "":
     AddMsgAndPrint("- Groundwater rasters not defined. Passing to grid creation...")
     pass
 else:
+    # Every groundwater profile shares the same confidence renderer, so it is only built through the symbology API for
+    # the first profile and copied onto the CIM definition of the others
+    gwlRenderer = None
     for Value in allValue:
         for i in range(0, gwlDEM.rowCount):
             raster = gwlDEM.getValue(i, 0)
@@ -1234,8 +1208,6 @@ else:
                             else:
                                 pass
                             cursor.updateRow(row)
-                        del row
-                        del cursor
                     cpDir = arcpy.SearchCursor(z_line, "", "", "", "QUAD D").next().getValue("QUAD")
                     cp = getCPValue(cpDir)
                     zm_line = os.path.join(scratchDir, "XSEC_{}_zm".format(Value))
@@ -1310,7 +1282,6 @@ else:
                             if (row[0] == 1 and row[1] == 1):
                                 row[2] = "CONFIDENT"
                                 cursor.updateRow(row)
-                        del row, cursor
 
                 else:
                     AddMsgAndPrint("    Creating the confidence zone polygon feature class...")
@@ -1352,20 +1323,20 @@ else:
                             if (row[0] == 1 and row[1] == 1):
                                 row[2] = "CONFIDENT"
                                 cursor.updateRow(row)
-                        del row, cursor
             except:
                 AddMsgAndPrint("ERROR 014: Failed to create confidence zone for {}".format(os.path.basename(raster)),
                                2)
                 raise SystemError
             try:
                 AddMsgAndPrint("    Create segmented profile for {} profile...".format(os.path.basename(raster)))
-                conEventsTable = os.path.join(scratchDir,
+                # The event table and located events are only read back once, so they stay in the memory workspace
+                conEventsTable = os.path.join("memory",
                                               "{}_polyEvents_{}".format(os.path.basename(confidenceZone), Value))
                 conProps = "rkey LINE FromM ToM"
                 arcpy.lr.LocateFeaturesAlongRoutes(confidenceZone, zm_line, checkField, "#", conEventsTable, conProps,
                                                    "FIRST", "NO_DISTANCE", "NO_ZERO")
-                locatedEvents_gwl = os.path.join(scratchDir,
-                                                  "{}_located_{}".format(os.path.basename(confidenceZone), Value))
+                locatedEvents_gwl = os.path.join("memory",
+                                                 "{}_located_{}".format(os.path.basename(confidenceZone), Value))
                 placeEvents(inRoutes=zm_line,
                             idRteFld=checkField,
                             eventTable=conEventsTable,
@@ -1377,10 +1348,8 @@ else:
                     gwlProfile = os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)), "XSEC_{}_GWL_AllYears_{}x".format(Value, ve))
                 else:
                     gwlProfile = os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)), "XSEC_{}_GWL_{}_{}_{}x".format(Value,startYear,endYear, ve))
-                arcpy.management.CreateFeatureclass(os.path.join(outGDB, "XSEC_{}".format(Value)),
-                                                    os.path.basename(gwlProfile), "POLYLINE", locatedEvents_gwl,
-                                                    "ENABLED", "ENABLED")
-                arcpy.management.Append(locatedEvents_gwl, gwlProfile, "NO_TEST")
+                with arcpy.EnvManager(outputMFlag="Enabled", outputZFlag="Enabled"):
+                    arcpy.management.CopyFeatures(locatedEvents_gwl, gwlProfile)
                 plan2side(ZMLines=gwlProfile, ve=ve)
             except:
                 AddMsgAndPrint("ERROR 015: Failed to segment the groundwater profile.", 2)
@@ -1398,28 +1367,34 @@ else:
                 gwlLayer = xsecMap.listLayers(os.path.splitext(os.path.basename(gwlProfile))[0])[0]
 
                 # Grids symbology...
-                symGWL = gwlLayer.symbology
-                symGWL.updateRenderer("UniqueValueRenderer")
-                gwlLayer.symbology = symGWL
-
-                symGWL.renderer.fields = ["CONFIDENCE"]
-                symGWL.renderer.removeValues({"CONFIDENCE": ["CONFIDENT", "INFERRED"]})
-                gwlLayer.symbology = symGWL
-                symGWL.renderer.addValues({"Confidence of Profile": ["CONFIDENT", "INFERRED"]})
-                gwlLayer.symbology = symGWL
-                for group in symGWL.renderer.groups:
-                    for item in group.items:
-                        if item.values[0][0] == "CONFIDENT":
-                            item.symbol.outlineColor = {'RGB': [0, 197, 255, 100]}
-                            item.symbol.outlineWidth = 1
-                            item.label = "Confident Surface"
-                            gwlLayer.symbology = symGWL
-                        elif item.values[0][0] == "INFERRED":
-                            item.symbol.applySymbolFromGallery('Dashed 6:6')
-                            item.symbol.outlineColor = {'RGB': [0, 197, 255, 100]}
-                            item.symbol.outlineWidth = 1
-                            item.label = "Inferred Surface"
-                            gwlLayer.symbology = symGWL
+                if gwlRenderer is None:
+                    symGWL = gwlLayer.symbology
+                    symGWL.updateRenderer("UniqueValueRenderer")
+                    gwlLayer.symbology = symGWL
+
+                    symGWL.renderer.fields = ["CONFIDENCE"]
+                    symGWL.renderer.removeValues({"CONFIDENCE": ["CONFIDENT", "INFERRED"]})
+                    gwlLayer.symbology = symGWL
+                    symGWL.renderer.addValues({"Confidence of Profile": ["CONFIDENT", "INFERRED"]})
+                    gwlLayer.symbology = symGWL
+                    for group in symGWL.renderer.groups:
+                        for item in group.items:
+                            if item.values[0][0] == "CONFIDENT":
+                                item.symbol.outlineColor = {'RGB': [0, 197, 255, 100]}
+                                item.symbol.outlineWidth = 1
+                                item.label = "Confident Surface"
+                                gwlLayer.symbology = symGWL
+                            elif item.values[0][0] == "INFERRED":
+                                item.symbol.applySymbolFromGallery('Dashed 6:6')
+                                item.symbol.outlineColor = {'RGB': [0, 197, 255, 100]}
+                                item.symbol.outlineWidth = 1
+                                item.label = "Inferred Surface"
+                                gwlLayer.symbology = symGWL
+                    gwlRenderer = gwlLayer.getDefinition("V3").renderer
+                else:
+                    gwlCIM = gwlLayer.getDefinition("V3")
+                    gwlCIM.renderer = gwlRenderer
+                    gwlLayer.setDefinition(gwlCIM)
                 prj.save()
                 AddMsgAndPrint("PLease make sure to change color symbology for different groundwater intervals.")
             except:
@@ -1431,60 +1406,6 @@ arcpy.AddMessage("BEGIN CREATING GRID LINES FOR CROSS-SECTIONS")
 for Value in allValue:
     try:
         arcpy.AddMessage("*Analyzing {}...*".format(Value))
-        arcpy.management.MakeFeatureLayer(lineLayer, "lineLayers")
-        arcpy.management.SelectLayerByAttribute("lineLayers", "NEW_SELECTION", "{}='{}'".format('XSEC', Value))
-
-        xs_name = "{}_{}".format(os.path.basename(lineLayer), Value)
-        tempFields = [f.name for f in arcpy.ListFields("lineLayers")]
-        checkField = "{}_ID".format(xs_name)
-        idField = next((f for f in tempFields if f == checkField), None)
-        idExists = fieldNone("lineLayers", checkField)
-
-        if idField is None or idExists == False:
-            idField = "ROUTEID"
-            arcpy.management.AddField("lineLayers", idField, "TEXT")
-            arcpy.management.CalculateField("lineLayers", checkField, "'01'", "PYTHON3")
-
-        desc = arcpy.da.Describe(lineLayer)
-        hasZ = desc["hasZ"]
-        hasM = desc["hasM"]
-
-        if hasZ and hasM:
-            zm_line = "lineLayers"
-            AddMsgAndPrint(
-                "*Cross-section {} in {} already has M and Z values".format(Value, os.path.basename(lineLayer)))
-        else:
-            # Add z values
-            z_line = os.path.join(scratchDir, "XSEC_{}_z".format(Value))
-            arcpy.ddd.InterpolateShape(dem, "lineLayers", z_line)
-            arcpy.management.AddField(z_line, "QUAD", "TEXT", "", "", "255", "", "NULLABLE")
-            with arcpy.da.UpdateCursor(z_line, ["DIRECTION", "QUAD"]) as cursor:
-                for row in cursor:
-                    if (row[0] == "W-E" or row[0] == "NW-SE" or row[0] == "E-W"):
-                        quad = "Northwest"
-                        row[1] = quad
-                        arcpy.AddMessage("- Analyzing from NW quad")
-                    if (row[0] == "SW-NE" or row[0] == "S-N" or row[0] == "N-S"):
-                        quad = "Southwest"
-                        row[1] = quad
-                        arcpy.AddMessage("- Analyzing from SW quad")
-                    if row[0] == "NE-SW":
-                        quad = "Northeast"
-                        row[1] = quad
-                        arcpy.AddMessage("- Analyzing from NE quad")
-                    if row[0] == "SE-NW":
-                        quad = "Southeast"
-                        row[1] = quad
-                        arcpy.AddMessage("- Analyzing from SE quad")
-                    else:
-                        pass
-                    cursor.updateRow(row)
-            del row, cursor
-            cpDir = arcpy.SearchCursor(z_line, "", "", "", "QUAD D").next().getValue("QUAD")
-            cp = getCPValue(cpDir)
-            zm_line = os.path.join(scratchDir, "XSEC_{}_zm".format(Value))
-            arcpy.lr.CreateRoutes(z_line, checkField, zm_line, "LENGTH", "#", "#", cp)
-
         AddMsgAndPrint("    Creating cross-section frame for {}".format(Value))
         descGridTB = arcpy.Describe(os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)), "XSEC_{}_LITH_{}x".format(Value, ve)))
         descGridRight = arcpy.Describe(os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)), "XSEC_{}_TOPO_{}x".format(Value, ve)))
@@ -1533,8 +1454,7 @@ for Value in allValue:
         arcpy.management.AddField(framePath, "LABEL", "TEXT", field_length=100)
         arcpy.management.AddField(framePath, "{}_ID".format(frameName), "TEXT", field_length=50)
         idPref = "{}FM".format(Value)
-        inRows = arcpy.da.SearchCursor(zm_line, "SHAPE@")
-        outRows = arcpy.da.InsertCursor(framePath,["TYPE","LABEL","SHAPE@","{}_ID".format(frameName)])
+        frameRows = []
 
         labelName = "XSEC_{}_{}x_Labels_{}".format(Value, ve,elevUnits)
         labelPath = os.path.join(os.path.join(outGDB, "XSEC_{}".format(Value)), labelName)
@@ -1658,7 +1578,7 @@ for Value in allValue:
                 leftpnt = (Xmin,yVE)
                 rightpnt = (Xmax, yVE)
                 c = c + 1
-                outRows.insertRow(["ELEVATION MARK",str(y),[leftpnt,rightpnt],"{}{}".format(idPref,c)])
+                frameRows.append(["ELEVATION MARK",str(y),[leftpnt,rightpnt],"{}{}".format(idPref,c)])
 
             # Build the distance tick intervals...
             for x in distList:
@@ -1675,16 +1595,11 @@ for Value in allValue:
                     distpnt1 = ((x * 5280) * 0.3048, newYmin)
                     distpnt2 = ((x * 5280) * 0.3048, newYmax)
                 c = c + 1
-                outRows.insertRow(["DISTANCE MARK",str(x),[distpnt1,distpnt2],"{}{}".format(idPref, c)])
-            array = []
-            array.append((Xmin, newYmax))
-            array.append((Xmin, newYmin))
-            array.append((Xmax, newYmin))
-            array.append((Xmax, newYmax))
-            array.append((Xmin, newYmax))
-            outRows.insertRow(["FRAME", "", array, "{}_1".format(idPref)])
-
-            del outRows
+                frameRows.append(["DISTANCE MARK",str(x),[distpnt1,distpnt2],"{}{}".format(idPref, c)])
+            frame = arcpy.Polyline(arcpy.Array([arcpy.Point(Xmin, newYmax), arcpy.Point(Xmin, newYmin),
+                                                arcpy.Point(Xmax, newYmin), arcpy.Point(Xmax, newYmax),
+                                                arcpy.Point(Xmin, newYmax)]), unknown)
+            frameRows.append(["FRAME", "", frame, "{}_1".format(idPref)])
 
             # Build the elevation points intervals...
             for y in elevList:
@@ -1709,6 +1624,12 @@ for Value in allValue:
                     distPnt = [(x * 5280) * 0.3048, newYmin]
                 c = c + 1
                 labelRows.insertRow(["DISTANCE MARK",str(int(x)),distPnt,"{}{}".format(idPref, c)])
+        del labelRows
+
+        # Write the tick marks and frame of every grid interval in one insert pass
+        with arcpy.da.InsertCursor(framePath, ["TYPE", "LABEL", "SHAPE@", "{}_ID".format(frameName)]) as outRows:
+            for row in frameRows:
+                outRows.insertRow(row)
     except:
         AddMsgAndPrint("ERROR 017: Could not create grid lines and labels for {}".format(Value),2)
         raise SystemError
@@ -1825,8 +1746,6 @@ for Value in allValue:
         xsecMap.defaultCamera.setExtent(arcpy.Describe(extentLyr).extent)
         xsecMap.openView()
         prj.save()
-        del inRows, labelRows
-        arcpy.management.Delete([zm_line,z_line])
         if custom == "true":
             arcpy.management.Delete([newBhPoints,newLithTable,newScrnTable])
         else:
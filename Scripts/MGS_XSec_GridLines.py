@@ -14,23 +14,35 @@ Last updated: 3/19/2024
 import os
 import arcpy
 import numpy as np
-import threading
+import copy
+
+# Constants
+# *******************************************************
+FT_TO_M = 0.3048
+MI_TO_FT = 5280
+
+# Meters per grid distance/elevation unit
+X_SCALE = {"Meters": 1.0, "Kilometers": 1000.0, "Feet": FT_TO_M, "Miles": MI_TO_FT * FT_TO_M}
+Y_SCALE = {"Meters": 1.0, "Feet": FT_TO_M}
 
 # Functions
 # *******************************************************
+class LicenseError(Exception):
+    pass
+
 def checkExtensions():
-    #Checking for the 3D Analyst extension
+    #Checking for the 3D Analyst and Location Referencing extensions
     try:
         if arcpy.CheckExtension("3D") == "Available":
             arcpy.CheckOutExtension("3D")
         else:
-            raise "LicenseError"
+            raise LicenseError("3D Analyst extension is unavailable")
         if arcpy.CheckExtension("LocationReferencing") == "Available":
             arcpy.CheckOutExtension("LocationReferencing")
         else:
-            raise "LicenseError"
-    except "LicenseError":
-        arcpy.AddMessage("3D Analyst extension is unavailable")
+            raise LicenseError("Location Referencing extension is unavailable")
+    except LicenseError as e:
+        AddMsgAndPrint(str(e), 2)
         raise SystemError
 
 def AddMsgAndPrint(msg,severity=0):
@@ -55,26 +67,16 @@ def testAndDelete(fc):
         arcpy.management.Delete(fc)
 
 def unique_values(table, field):
-    with arcpy.da.SearchCursor(table, field) as cursor:
-        return sorted({row[0] for row in cursor})
-    del row, cursor
+    # Ask the data source for distinct values, falling back to a full scan where DISTINCT isn't supported
+    try:
+        with arcpy.da.SearchCursor(table, [field], sql_clause=("DISTINCT {}".format(field), None)) as cursor:
+            return sorted({row[0] for row in cursor})
+    except RuntimeError:
+        with arcpy.da.SearchCursor(table, [field]) as cursor:
+            return sorted({row[0] for row in cursor})
 
 def round2int(x,base):
-    return base * round(x/base)
-
-def getCPValue(quadrant):
-    cpDict = {"Northwest":"UPPER_LEFT", "Southwest":"LOWER_LEFT", "Northeast":"UPPER_RIGHT", "Southeast":"LOWER_RIGHT"}
-    return cpDict[quadrant]
-
-def fieldNone(fc, field):
-    try:
-        with arcpy.da.SearchCursor(fc, field) as rows:
-            if rows.next()[0] in [None, ""]:
-                return False
-            else:
-                return True
-    except:
-        return False
+    return base * np.round(np.asarray(x) / base)
 
 # Parameters
 # *******************************************************
@@ -97,6 +99,8 @@ ve = arcpy.GetParameterAsText(4)
 grids = arcpy.ValueTable(4)
 grids.loadFromString(arcpy.GetParameterAsText(5))
 
+ve_f = float(ve)
+
 # Local Variables
 # *******************************************************
 checkExtensions()
@@ -107,9 +111,11 @@ unknown = arcpy.SpatialReference(text=wkt)
 # Begin
 # *******************************************************
 # Environment Variables
-local = threading.local()
 arcpy.env.overwriteOutput = True
 arcpy.env.transferDomains = True
+# Grids are drawn into each cross-section's map from the "CURRENT" project, so sections stay sequential;
+# the geoprocessing tools they call can use all cores on their own
+arcpy.env.parallelProcessingFactor = "100%"
 prj = arcpy.mp.ArcGISProject("CURRENT")
 scratchDir = prj.defaultGeodatabase
 AddMsgAndPrint(msg="Scratch Geodatabase: {}".format(os.path.basename(scratchDir)),
@@ -123,120 +129,51 @@ arcpy.AddMessage("BEGIN CREATING GRID LINES FOR CROSS-SECTIONS")
 for Value in allValue:
     try:
         arcpy.AddMessage("*Analyzing {}...*".format(Value))
-        arcpy.management.MakeFeatureLayer(lineLayer, "lineLayers")
-        arcpy.management.SelectLayerByAttribute("lineLayers", "NEW_SELECTION", "{}='{}'".format('XSEC', Value))
-
-        xs_name = "{}_{}".format(os.path.basename(lineLayer), Value)
-        tempFields = [f.name for f in arcpy.ListFields("lineLayers")]
-        checkField = "{}_ID".format(xs_name)
-        idField = next((f for f in tempFields if f == checkField), None)
-        idExists = fieldNone("lineLayers", checkField)
-
-        if idField is None or idExists == False:
-            idField = "ROUTEID"
-            arcpy.management.AddField("lineLayers", idField, "TEXT")
-            arcpy.management.CalculateField("lineLayers", checkField, "'01'", "PYTHON3")
-
-        desc = arcpy.da.Describe(lineLayer)
-        hasZ = desc["hasZ"]
-        hasM = desc["hasM"]
-
-        if hasZ and hasM:
-            zm_line = "lineLayers"
-            AddMsgAndPrint(
-                "*Cross-section {} in {} already has M and Z values".format(Value, os.path.basename(lineLayer)))
-        else:
-            # Add z values
-            z_line = os.path.join(scratchDir, "XSEC_{}_z".format(Value))
-            arcpy.ddd.InterpolateShape(dem, "lineLayers", z_line)
-            arcpy.management.AddField(z_line, "QUAD", "TEXT", "", "", "255", "", "NULLABLE")
-            with arcpy.da.UpdateCursor(z_line, ["DIRECTION", "QUAD"]) as cursor:
-                for row in cursor:
-                    if (row[0] == "W-E" or row[0] == "NW-SE" or row[0] == "E-W"):
-                        quad = "Northwest"
-                        row[1] = quad
-                        arcpy.AddMessage("- Analyzing from NW quad")
-                    if (row[0] == "SW-NE" or row[0] == "S-N" or row[0] == "N-S"):
-                        quad = "Southwest"
-                        row[1] = quad
-                        arcpy.AddMessage("- Analyzing from SW quad")
-                    if row[0] == "NE-SW":
-                        quad = "Northeast"
-                        row[1] = quad
-                        arcpy.AddMessage("- Analyzing from NE quad")
-                    if row[0] == "SE-NW":
-                        quad = "Southeast"
-                        row[1] = quad
-                        arcpy.AddMessage("- Analyzing from SE quad")
-                    else:
-                        pass
-                    cursor.updateRow(row)
-            del row, cursor
-            cpDir = arcpy.SearchCursor(z_line, "", "", "", "QUAD D").next().getValue("QUAD")
-            cp = getCPValue(cpDir)
-            zm_line = os.path.join(scratchDir, "XSEC_{}_zm".format(Value))
-            arcpy.lr.CreateRoutes(z_line, checkField, zm_line, "LENGTH", "#", "#", cp)
-
+        xsecGDB = os.path.join(outGDB, "XSEC_{}".format(Value))
+        lithPath = os.path.join(xsecGDB, "XSEC_{}_LITH_{}x".format(Value, ve))
+        topoPath = os.path.join(xsecGDB, "XSEC_{}_TOPO_{}x".format(Value, ve))
+        bdrkPath = os.path.join(xsecGDB, "XSEC_{}_BDRK_{}x".format(Value, ve))
         AddMsgAndPrint("    Creating cross-section frame for {}".format(Value))
-        descGridTB = arcpy.Describe(os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)), "XSEC_{}_LITH_{}x".format(Value, ve)))
-        descGridRight = arcpy.Describe(os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)), "XSEC_{}_TOPO_{}x".format(Value, ve)))
-        if arcpy.Exists(os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)), "XSEC_{}_BDRK_{}x".format(Value, ve))):
-            descGridBot = arcpy.Describe(os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)), "XSEC_{}_BDRK_{}x".format(Value, ve)))
+        # Describe each cross-section dataset once and reuse its extent...
+        extentTB = arcpy.Describe(lithPath).extent
+        extentRight = arcpy.Describe(topoPath).extent
+        bdrkExists = arcpy.Exists(bdrkPath)
+        if bdrkExists:
+            extentBot = arcpy.Describe(bdrkPath).extent
         Xmin = 0
-        Xmax = descGridRight.extent.XMax
-        bhYmax = descGridTB.extent.YMax
-        if arcpy.Exists(os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)), "XSEC_{}_BDRK_{}x".format(Value, ve))):
-            bdrkYmin = descGridBot.extent.ZMin
-            bhYmin = descGridTB.extent.YMin
-            if elevUnits == "Feet":
-                if bhYmin > ((bdrkYmin * 0.3048)*int(ve)):
-                    Ymin = ((bdrkYmin * 0.3048)*int(ve))
-                elif bhYmin < ((bdrkYmin * 0.3048)*int(ve)):
-                    Ymin = bhYmin
-                elif bhYmin == ((bdrkYmin * 0.3048)*int(ve)):
-                    # Doesn't matter which one since they have the same elevation minimum. This will likely never happen, but just in case it does...
-                    Ymin = bhYmin
-            if elevUnits == "Meters":
-                if bhYmin > (bdrkYmin * int(ve)):
-                    Ymin = (bdrkYmin * int(ve))
-                elif bhYmin < (bdrkYmin *int(ve)):
-                    Ymin = bhYmin
-                elif bhYmin == (bdrkYmin * int(ve)):
-                    # Doesn't matter which one since they have the same elevation minimum. This will likely never happen, but just in case it does...
-                    Ymin = bhYmin
+        Xmax = extentRight.XMax
+        bhYmax = extentTB.YMax
+        if bdrkExists:
+            bhYmin = extentTB.YMin
+            # Bedrock Z is stored in project elevation units and isn't exaggerated yet...
+            bdrkScaled = extentBot.ZMin * Y_SCALE[elevUnits] * int(ve)
+            Ymin = min(bhYmin, bdrkScaled)
         else:
-            bhYmin = descGridTB.extent.YMin
+            bhYmin = extentTB.YMin
             Ymin = bhYmin
-        # arcpy.AddMessage("Minimum X: {0}\nMaximum X: {1}\nMaximum Borehole Y: {2}\nMinimum Borehole Y: {3}\nMaximum Topo Y: {4}\nMinimum Topo Y: {5}".format(Xmin,Xmax,bhYmax,bhYmin,descGridRight.extent.YMax,descGridRight.extent.YMin))
-        if descGridRight.extent.YMax > bhYmax:
-            Ymax = descGridRight.extent.YMax
-        elif descGridRight.extent.YMax < bhYmax:
-            Ymax = bhYmax
-        elif descGridRight.extent.YMax == bhYmax:
-            # Doesn't matter which one since they have the same elevation maximum. This will likely never happen, but just in case it does...
-            Ymax = bhYmax
+        # arcpy.AddMessage("Minimum X: {0}\nMaximum X: {1}\nMaximum Borehole Y: {2}\nMinimum Borehole Y: {3}\nMaximum Topo Y: {4}\nMinimum Topo Y: {5}".format(Xmin,Xmax,bhYmax,bhYmin,extentRight.YMax,extentRight.YMin))
+        Ymax = max(extentRight.YMax, bhYmax)
 
         frameName = "XSEC_{}_{}x_Frame_{}".format(Value,ve,elevUnits)
-        framePath = os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)),frameName)
+        framePath = os.path.join(xsecGDB, frameName)
         testAndDelete(framePath)
-        arcpy.management.CreateFeatureclass(os.path.join(outGDB,"XSEC_{}".format(Value)),frameName,"POLYLINE",
+        arcpy.management.CreateFeatureclass(xsecGDB,frameName,"POLYLINE",
                                             spatial_reference=unknown)
         arcpy.management.AddField(framePath, "TYPE", "TEXT", field_length=100)
         arcpy.management.AddField(framePath, "LABEL", "TEXT", field_length=100)
         arcpy.management.AddField(framePath, "{}_ID".format(frameName), "TEXT", field_length=50)
         idPref = "{}FM".format(Value)
-        inRows = arcpy.da.SearchCursor(zm_line, "SHAPE@")
-        outRows = arcpy.da.InsertCursor(framePath,["TYPE","LABEL","SHAPE@","{}_ID".format(frameName)])
+        frameRows = []
 
         labelName = "XSEC_{}_{}x_Labels_{}".format(Value, ve,elevUnits)
-        labelPath = os.path.join(os.path.join(outGDB, "XSEC_{}".format(Value)), labelName)
+        labelPath = os.path.join(xsecGDB, labelName)
         testAndDelete(labelPath)
-        arcpy.management.CreateFeatureclass(os.path.join(outGDB, "XSEC_{}".format(Value)), labelName, "POINT",
+        arcpy.management.CreateFeatureclass(xsecGDB, labelName, "POINT",
                                             spatial_reference=unknown)
         arcpy.management.AddField(labelPath, "TYPE", "TEXT", field_length=100)
         arcpy.management.AddField(labelPath, "LABEL", "TEXT", field_length=100)
         arcpy.management.AddField(labelPath, "{}_ID".format(labelName), "TEXT", field_length=50)
-        labelRows = arcpy.da.InsertCursor(labelPath, ["TYPE", "LABEL", "SHAPE@", "{}_ID".format(labelName)])
+        labelRows = []
 
         for i in range(0, grids.rowCount):
             xInt = grids.getValue(i, 0)
@@ -244,163 +181,77 @@ for Value in allValue:
             yInt = grids.getValue(i, 2)
             yUnits = grids.getValue(i, 3)
 
+            xSpacing = float(xInt)
+            ySpacing = float(yInt)
+            xScale = X_SCALE[xUnits]
+            yScale = Y_SCALE[yUnits]
+
             AddMsgAndPrint("Distance Units: {} {}".format(xInt,xUnits))
             AddMsgAndPrint("Elevation Units: {} {}".format(yInt, yUnits))
-            if yUnits == "Meters":
-                botY = round2int(x=(Ymin / float(ve)),
-                                 base=float(yInt))
-                if int(Ymin/float(ve)) < botY:
-                    newYmin = (botY*float(ve)) - (int(yInt)*float(ve))
-                else:
-                    newYmin = botY*float(ve)
+            botY = round2int(x=(Ymin / ve_f) / yScale,
+                             base=ySpacing)
+            if int((Ymin / ve_f) / yScale) < botY:
+                newYmin = (botY - int(ySpacing)) * yScale * ve_f
             else:
-                botY = round2int(x=((Ymin / float(ve))/0.3048),
-                                 base=float(yInt))
-                if int((Ymin/float(ve))/0.3048) < botY:
-                    newYmin = (botY*float(ve)*0.3048) - (int(yInt)*float(ve)*0.3048)
-                else:
-                    newYmin = botY * 0.3048*float(ve)
+                newYmin = botY * yScale * ve_f
 
             # Define the minimum and maximum elevation and distance tick marks...
-            if yUnits == "Meters":
-                elevTickMin = round2int(x=newYmin // float(ve),
-                                        base=float(yInt))
-                elevTickMax = round2int(x=Ymax // float(ve),
-                                        base=float(yInt))
-            elif yUnits == "Feet":
-                elevTickMin = round2int(x=(newYmin // float(ve))/0.3048,
-                                        base=float(yInt))
-                elevTickMax = round2int(x=(Ymax // float(ve))/0.3048,
-                                        base=float(yInt))
-
-            if xUnits == "Meters":
-                distTickMin = round2int(x=Xmin,
-                                        base=float(xInt))
-                distTickMax = round2int(x=Xmax,
-                                        base=float(xInt))
-                if distTickMax > Xmax:
-                    newDistTickMax = distTickMax - (float(xInt))
-                elif distTickMax < Xmax:
-                    newDistTickMax = distTickMax
-                elif distTickMax == Xmax:
-                    newDistTickMax = distTickMax
-                distList = np.arange(distTickMin, newDistTickMax+1, float(xInt))
-            elif xUnits == "Kilometers":
-                distTickMin = round2int(x=Xmin/1000,
-                                        base=float(xInt))
-                distTickMax = round2int(x=Xmax/1000,
-                                        base=float(xInt))
-                if distTickMax > (Xmax / 1000):
-                    newDistTickMax = distTickMax - (float(xInt))
-                elif distTickMax < (Xmax / 1000):
-                    newDistTickMax = distTickMax
-                elif distTickMax == (Xmax / 1000):
-                    newDistTickMax = distTickMax
-                distList = np.arange(distTickMin, newDistTickMax+1, float(xInt))
-            elif xUnits == "Feet":
-                distTickMin = round2int(x=Xmin//0.3048,
-                                        base=float(xInt))
-                distTickMax = round2int(x=Xmax//0.3048,
-                                        base=float(xInt))
-                if distTickMax > (Xmax / 0.3048):
-                    newDistTickMax = distTickMax - (float(xInt))
-                elif distTickMax < (Xmax / 0.3048):
-                    newDistTickMax = distTickMax
-                elif distTickMax == (Xmax / 0.3048):
-                    newDistTickMax = distTickMax
-                distList = np.arange(distTickMin, newDistTickMax+1, float(xInt))
-            elif xUnits == "Miles":
-                distTickMin = round2int(x=(Xmin//0.3048)/5280,
-                                        base=float(xInt))
-                distTickMax = round2int(x=(Xmax//0.3048)/5280,
-                                        base=float(xInt))
-                if distTickMax > ((Xmax / 0.3048)/5280):
-                    newDistTickMax = distTickMax - (float(xInt))
-                elif distTickMax < ((Xmax / 0.3048)/5280):
-                    newDistTickMax = distTickMax
-                elif distTickMax == ((Xmax / 0.3048)/5280):
-                    newDistTickMax = distTickMax
-                distList = np.arange(distTickMin, newDistTickMax+1, float(xInt))
+            elevTickMin, elevTickMax = round2int(x=np.floor_divide([newYmin, Ymax], ve_f) / yScale,
+                                                 base=ySpacing)
+            distTickMin, distTickMax = round2int(x=np.array([Xmin, Xmax]) / xScale,
+                                                 base=xSpacing)
+            newDistTickMax = distTickMax - xSpacing if distTickMax > (Xmax / xScale) else distTickMax
+            distList = np.arange(distTickMin, newDistTickMax+1, xSpacing)
 
             # Build out the frame for the cross-section...
-            if yUnits == "Feet":
-                if (elevTickMax * 0.3048 * float(ve)) < Ymax:
-                    newElevTickMax = elevTickMax + int(yInt)
-                    newYmax = (elevTickMax * 0.3048 * float(ve)) + (float(yInt) * 0.3048 * float(ve))
-                elif (elevTickMax * 0.3048 * float(ve)) > Ymax:
-                    newElevTickMax = elevTickMax
-                    newYmax = (elevTickMax * 0.3048 * float(ve))
-                elevList = np.arange(elevTickMin, newElevTickMax+1, float(yInt))
-            elif yUnits == "Meters":
-                if (elevTickMax * float(ve)) < Ymax:
-                    newElevTickMax = elevTickMax + int(yInt)
-                    newYmax = (elevTickMax * float(ve)) + (float(yInt) * float(ve))
-                elif (elevTickMax * float(ve)) > Ymax:
-                    newElevTickMax = elevTickMax
-                    newYmax = (elevTickMax * float(ve))
-                elevList = np.arange(elevTickMin, newElevTickMax+1, float(yInt))
+            if (elevTickMax * yScale * ve_f) < Ymax:
+                newElevTickMax = elevTickMax + int(ySpacing)
+                newYmax = (elevTickMax + ySpacing) * yScale * ve_f
+            else:
+                newElevTickMax = elevTickMax
+                newYmax = elevTickMax * yScale * ve_f
+            elevList = np.arange(elevTickMin, newElevTickMax+1, ySpacing)
+
+            # Scale the tick values into cross-section coordinates...
+            elevY = elevList * yScale * ve_f
+            distX = distList * xScale
+            distBot = np.column_stack((distX, np.full(distX.size, newYmin))).tolist()
+            distTop = np.column_stack((distX, np.full(distX.size, newYmax))).tolist()
 
             # Build the elevation tick intervals...
             c = 1
-            for y in elevList:
-                if yUnits == "Feet":
-                    yVE = y * 0.3048 * float(ve)
-                elif yUnits == "Meters":
-                    yVE = y * float(ve)
-                leftpnt = (Xmin,yVE)
-                rightpnt = (Xmax, yVE)
+            for y, yVE in zip(elevList, elevY):
                 c = c + 1
-                outRows.insertRow(["ELEVATION MARK",str(y),[leftpnt,rightpnt],"{}{}".format(idPref,c)])
+                frameRows.append(["ELEVATION MARK",str(y),[(Xmin,yVE),(Xmax,yVE)],"{}{}".format(idPref,c)])
 
             # Build the distance tick intervals...
-            for x in distList:
-                if xUnits == "Meters":
-                    distpnt1 = (x, newYmin)
-                    distpnt2 = (x, newYmax)
-                elif xUnits == "Kilometers":
-                    distpnt1 = (x * 1000, newYmin)
-                    distpnt2 = (x * 1000, newYmax)
-                elif xUnits == "Feet":
-                    distpnt1 = (x * 0.3048, newYmin)
-                    distpnt2 = (x * 0.3048, newYmax)
-                elif xUnits == "Miles":
-                    distpnt1 = ((x * 5280) * 0.3048, newYmin)
-                    distpnt2 = ((x * 5280) * 0.3048, newYmax)
+            for x, distpnt1, distpnt2 in zip(distList, distBot, distTop):
                 c = c + 1
-                outRows.insertRow(["DISTANCE MARK",str(x),[distpnt1,distpnt2],"{}{}".format(idPref, c)])
-            array = []
-            array.append((Xmin, newYmax))
-            array.append((Xmin, newYmin))
-            array.append((Xmax, newYmin))
-            array.append((Xmax, newYmax))
-            array.append((Xmin, newYmax))
-            outRows.insertRow(["FRAME", "", array, "{}_1".format(idPref)])
-
-            del outRows
+                frameRows.append(["DISTANCE MARK",str(x),[distpnt1,distpnt2],"{}{}".format(idPref, c)])
+            frame = arcpy.Polyline(arcpy.Array([arcpy.Point(Xmin, newYmax), arcpy.Point(Xmin, newYmin),
+                                                arcpy.Point(Xmax, newYmin), arcpy.Point(Xmax, newYmax),
+                                                arcpy.Point(Xmin, newYmax)]), unknown)
+            frameRows.append(["FRAME", "", frame, "{}_1".format(idPref)])
 
             # Build the elevation points intervals...
-            for y in elevList:
-                if yUnits == "Feet":
-                    yVE = y * 0.3048 * float(ve)
-                elif yUnits == "Meters":
-                    yVE = y * float(ve)
-                elevPnt = [Xmin, yVE]
+            for y, yVE in zip(elevList, elevY):
                 c = c + 1
-                labelRows.insertRow(["ELEVATION MARK", str(int(y)), elevPnt, "{}{}".format(idPref, c)])
+                labelRows.append(["ELEVATION MARK", str(int(y)), (Xmin, yVE), "{}{}".format(idPref, c)])
             c = c + 1
 
             # Build the distance points intervals...
-            for x in distList:
-                if xUnits == "Meters":
-                    distPnt = [x, newYmin]
-                elif xUnits == "Kilometers":
-                    distPnt = [x * 1000, newYmin]
-                elif xUnits == "Feet":
-                    distPnt = [x * 0.3048, newYmin]
-                elif xUnits == "Miles":
-                    distPnt = [(x * 5280) * 0.3048, newYmin]
+            for x, distPnt in zip(distList, distBot):
                 c = c + 1
-                labelRows.insertRow(["DISTANCE MARK",str(int(x)),distPnt,"{}{}".format(idPref, c)])
+                labelRows.append(["DISTANCE MARK",str(int(x)),tuple(distPnt),"{}{}".format(idPref, c)])
+
+        # Write the frame and label features for every grid spacing...
+        with arcpy.da.InsertCursor(framePath, ["TYPE", "LABEL", "SHAPE@", "{}_ID".format(frameName)]) as outRows:
+            for row in frameRows:
+                outRows.insertRow(row)
+        with arcpy.da.InsertCursor(labelPath, ["TYPE", "LABEL", "SHAPE@XY", "{}_ID".format(labelName)]) as outRows:
+            for row in labelRows:
+                outRows.insertRow(row)
+        del frameRows, labelRows
     except:
         AddMsgAndPrint("ERROR 017: Could not create grid lines and labels for {}".format(Value),2)
         raise SystemError
@@ -420,70 +271,45 @@ for Value in allValue:
         symLabels.renderer.symbol.outlineColor = {'RGB': [0, 0, 0, 0]}
         symLabels.renderer.symbol.outlineWidth = 2
         labelLayer.symbology = symLabels
-        prj.save()
 
         # Grids symbology...
         symGrids.updateRenderer("UniqueValueRenderer")
-        gridLayer.symbology = symGrids
-
         symGrids.renderer.fields = ["TYPE"]
         symGrids.renderer.removeValues({"TYPE": ["FRAME","DISTANCE MARK","ELEVATION MARK"]})
-        gridLayer.symbology = symGrids
         symGrids.renderer.addValues({"Type": ["FRAME","DISTANCE MARK","ELEVATION MARK"]})
-        gridLayer.symbology = symGrids
         for group in symGrids.renderer.groups:
             for item in group.items:
                 if item.values[0][0] == "FRAME":
                     item.symbol.outlineColor = {'RGB': [0, 0, 0, 100]}
                     item.symbol.outlineWidth = 2
                     item.label = "Border Frame"
-                    gridLayer.symbology = symGrids
                 elif item.values[0][0] == "DISTANCE MARK":
                     item.symbol.outlineColor = {'RGB': [178, 178, 178, 100]}
                     item.symbol.outlineWidth = 0.5
                     item.label = "Grid Lines"
-                    gridLayer.symbology = symGrids
                 elif item.values[0][0] == "ELEVATION MARK":
                     item.symbol.outlineColor = {'RGB': [178, 178, 178, 100]}
                     item.symbol.outlineWidth = 0.5
                     item.label = "Grid Lines"
-                    gridLayer.symbology = symGrids
-        prj.save()
+        gridLayer.symbology = symGrids
 
         try:
             cimObject = labelLayer.getDefinition("V3")
-            lblClasses = cimObject.labelClasses
-            #elevLblClass = arcpy.cim.CreateCIMObjectFromClassName("CIMLabelClass","V3")
-            #elevLblClass.name = "Elevation"
-            #elevLblClass.visibility = True
-            #cimObject.labelClasses.append(elevLblClass)
-            #labelLayer.setDefinition(cimObject)
-
-            for lblClass in lblClasses:
+            # Split the default label class into distance and elevation classes...
+            for lblClass in cimObject.labelClasses:
                 if lblClass.name == "Class 1":
                     lblClass.name = "Distance"
-                    nlc_index = cimObject.labelClasses.index(lblClass)
-                    newClass = cimObject.labelClasses.copy()[nlc_index]
+                    newClass = copy.deepcopy(lblClass)
+                    newClass.name = "Elevation"
                     cimObject.labelClasses.append(newClass)
-                    labelLayer.setDefinition(cimObject)
                     break
 
-            cimObject = labelLayer.getDefinition("V3")
-            lblClasses = cimObject.labelClasses
-            for lblClass in lblClasses:
-                if lblClass.name == "Distance":
-                    nlc_index = cimObject.labelClasses.index(lblClass)
-                    if nlc_index != 0:
-                        lblClass.name = "Elevation"
-                        labelLayer.setDefinition(cimObject)
-
             # Place the labels correctly...
             lblClassDist_2 = cimObject.labelClasses[0]
             lblClassDist_2.maplexLabelPlacementProperties.pointPlacementMethod = "SouthOfPoint"
             lblClassDist_2.maplexLabelPlacementProperties.rotationProperties.enable = True
             lblClassDist_2.maplexLabelPlacementProperties.rotationProperties.additionalAngle = -45
             lblClassDist_2.maplexLabelPlacementProperties.primaryOffset = 10.0
-            labelLayer.setDefinition(cimObject)
 
             lblClassElev_2 = cimObject.labelClasses[1]
             lblClassElev_2.maplexLabelPlacementProperties.pointPlacementMethod = "WestOfPoint"
@@ -505,19 +331,13 @@ for Value in allValue:
                 lblClassElev.visible = True
             else:
                 pass
-            prj.save()
-
-
 
         except Exception as e:
             AddMsgAndPrint("Could not complete labels and symbology. Error Message: {}. Passing to final steps...".format(e),1)
             pass
 
-        extentLyr = xsecMap.listLayers(os.path.splitext(os.path.basename(labelPath))[0])[0]
-        xsecMap.defaultCamera.setExtent(arcpy.Describe(extentLyr).extent)
+        xsecMap.defaultCamera.setExtent(arcpy.Describe(labelLayer).extent)
         prj.save()
-        del inRows, labelRows
-        arcpy.management.Delete([zm_line,z_line])
     except:
         AddMsgAndPrint("ERROR 018: Failed to clean up {}".format(os.path.basename(scratchDir)),2)
         raise SystemError
\ No newline at end of file
@@ -18,6 +18,29 @@ import arcpy
 import re
 import datetime
 import math
+import numpy as np
+
+# Constants
+# *******************************************************
+# Route starting quadrant for each cross-section line direction
+QUAD_MAP = {"W-E": "Northwest", "NW-SE": "Northwest", "E-W": "Northwest",
+            "SW-NE": "Southwest", "S-N": "Southwest", "N-S": "Southwest",
+            "NE-SW": "Northeast",
+            "SE-NW": "Southeast"}
+QUAD_CODEBLOCK = """quadMap = {}
+def lookup(direction):
+    return quadMap.get(direction, "Northwest")""".format(QUAD_MAP)
+
+# Route coordinate priority for each starting quadrant
+CP_DICT = {"Northwest":"UPPER_LEFT", "Southwest":"LOWER_LEFT", "Northeast":"UPPER_RIGHT", "Southeast":"LOWER_RIGHT"}
+
+# Error reported when each step of a bedrock or groundwater profile fails
+BDRK_ERRORS = {"route": "ERROR 009: Failed to create bedrock surface for {Value}",
+               "segment": "ERROR 011: Failed to segment the bedrock profile.",
+               "cleanup": "ERROR 012: Failed to clean up {scratch}"}
+GWL_ERRORS = {"route": "ERROR 013: Failed to create {raster} for XSEC {Value}",
+              "segment": "ERROR 015: Failed to segment the groundwater profile.",
+              "cleanup": "ERROR 016: Failed to clean up {scratch}"}
 
 # Functions
 # *******************************************************
@@ -58,59 +81,196 @@ def testAndDelete(fc):
         arcpy.management.Delete(fc)
 
 def unique_values(table, field):
-    with arcpy.da.SearchCursor(table, field) as cursor:
-        return sorted({row[0] for row in cursor})
-    del row, cursor
+    values = arcpy.da.TableToNumPyArray(table, [field], skip_nulls=True)[field]
+    return np.unique(values).tolist()
 
 def getCPValue(quadrant):
-    cpDict = {"Northwest":"UPPER_LEFT", "Southwest":"LOWER_LEFT", "Northeast":"UPPER_RIGHT", "Southeast":"LOWER_RIGHT"}
-    return cpDict[quadrant]
+    return CP_DICT[quadrant]
 
 def fieldNone(fc, field):
+    # True when the first row holds a value; only one row is ever fetched
     try:
-        with arcpy.da.SearchCursor(fc, field) as rows:
-            if rows.next()[0] in [None, ""]:
-                return False
-            else:
-                return True
-    except:
-        return False
+        with arcpy.da.SearchCursor(fc, [field]) as rows:
+            for row in rows:
+                return row[0] not in (None, "")
+    except RuntimeError:
+        pass
+    return False
 
 def placeEvents(inRoutes, idRteFld, eventTable, eventRteFld, fromVar, toVar, eventLay):
     props = "{} LINE {} {}".format(eventRteFld, fromVar, toVar)
     arcpy.lr.MakeRouteEventLayer(inRoutes, idRteFld, eventTable, props, "layer")
-    arcpy.management.CopyFeatures("layer", "layer2")
-    arcpy.management.MakeFeatureLayer("layer2", "layer3", "Shape_Length <> 0")
-    arcpy.management.CopyFeatures("layer3", eventLay)
-    descEvent = arcpy.ListFields(eventLay)
-    if "WELLID" in descEvent:
+    arcpy.management.CopyFeatures("layer", eventLay)
+    arcpy.management.MakeFeatureLayer(eventLay, "zeroLength", "Shape_Length = 0")
+    arcpy.management.DeleteRows("zeroLength")
+    arcpy.management.Delete(["layer", "zeroLength"])
+    if arcpy.ListFields(eventLay, "WELLID"):
         arcpy.management.DeleteIdentical(eventLay, "WELLID")
-    else:
-        pass
 
-def plan2side(ZMLines, ve):
-    rows = arcpy.UpdateCursor(ZMLines)
-    n = 0
-    for row in rows:
-        feat = row.shape
-        newFeatShape = arcpy.Array()
-        a = 0
-        while a < feat.partCount:
-            newArray = feat.getPart(a)
-            newShapeArray = arcpy.Array()
-            pntOld = newArray.next()
-            while pntOld:
-                pntOld.X = float(pntOld.M) + float(moveLength)
-                if elevUnits == "Meters":
-                    pntOld.Y = float(pntOld.Z) * float(ve)
-                if elevUnits == "Feet":
-                    pntOld.Y = (float(pntOld.Z) * 0.3048) * float(ve)
-                newShapeArray.add(pntOld)
-                pntOld = newArray.next()
-            newFeatShape.add(newShapeArray)
-            a = a + 1
-        row.shape = newFeatShape
-        rows.updateRow(row)
+def plan2side(ZMLines, ve, moveLength):
+    # Swaps each vertex to X = route measure + offset and Y = exaggerated elevation, keeping its Z and M
+    yFactor = (0.3048 if elevUnits == "Feet" else 1.0) * float(ve)
+    with arcpy.da.UpdateCursor(ZMLines, ["SHAPE@"]) as cursor:
+        for row in cursor:
+            feat = row[0]
+            newFeatShape = arcpy.Array()
+            for part in feat:
+                mz = np.array([(pnt.M, pnt.Z) for pnt in part], dtype=np.float64).reshape(-1, 2)
+                sideXY = np.column_stack((mz[:, 0] + float(moveLength), mz[:, 1] * yFactor))
+                newFeatShape.add(arcpy.Array([arcpy.Point(x, y, z, m) for (x, y), (m, z) in zip(sideXY.tolist(), mz.tolist())]))
+            cursor.updateRow([arcpy.Polyline(newFeatShape, feat.spatialReference, True, True)])
+
+def xBounds(fc):
+    # X range covered by the features in a feature class or layer selection
+    with arcpy.da.SearchCursor(fc, ["SHAPE@"]) as cursor:
+        extents = [row[0].extent for row in cursor]
+    return min(e.XMin for e in extents), max(e.XMax for e in extents)
+
+def classifyConfidence(zone, extentField, buffField):
+    # Drops union polygons outside the raster extent and marks the rest by whether they fall in the borehole buffer
+    arcpy.management.MakeFeatureLayer(zone, "outsideZone", "{} = -1".format(extentField))
+    arcpy.management.DeleteRows("outsideZone")
+    arcpy.management.MakeFeatureLayer(zone, "inferredZone", "{} = 1 AND {} = -1".format(extentField, buffField))
+    arcpy.management.CalculateField("inferredZone", "CONFIDENCE", "'INFERRED'", "PYTHON3")
+    arcpy.management.MakeFeatureLayer(zone, "confidentZone", "{} = 1 AND {} = 1".format(extentField, buffField))
+    arcpy.management.CalculateField("confidentZone", "CONFIDENCE", "'CONFIDENT'", "PYTHON3")
+    arcpy.management.Delete(["outsideZone", "inferredZone", "confidentZone"])
+
+def profileRoute(raster, Value, featExtent, prefix):
+    # Drapes cross-section Value on the raster as a route and measures how far along the line the raster begins
+    xsLine = xsecLines[Value]
+    checkField = "{}_{}_ID".format(lineName, Value)
+    if checkField not in lineFields or fieldNone(xsLine, checkField) == False:
+        checkField = "ROUTEID"
+
+    if hasZ and hasM:
+        AddMsgAndPrint(
+            "*Cross-section {} in {} already has M and Z values".format(Value, lineName))
+        return xsLine, checkField, 0
+
+    # Add z values
+    z_line = os.path.join(scratchMem, "XSEC_{}_z".format(Value))
+    arcpy.ddd.InterpolateShape(raster, xsLine, z_line)
+    arcpy.management.AddField(z_line, "QUAD", "TEXT", "", "", "255", "", "NULLABLE")
+    arcpy.management.CalculateField(z_line, "QUAD", "lookup(!DIRECTION!)", "PYTHON3", QUAD_CODEBLOCK)
+    with arcpy.da.SearchCursor(z_line, ["QUAD"], "QUAD IS NOT NULL") as cursor:
+        cpDir = max(row[0] for row in cursor)
+    arcpy.AddMessage("- Analyzing from {} quad".format(cpDir))
+    cp = getCPValue(cpDir)
+    zm_line = os.path.join(scratchMem, "XSEC_{}_zm".format(Value))
+    arcpy.lr.CreateRoutes(z_line, checkField, zm_line, "LENGTH", "#", "#", cp)
+
+    # Now we need to determine if the profile starts after the beginning of the line.
+    # Step 1: Erase the temporary feature layer to exclude the area inside the raster area...
+    eraseFeat = os.path.join(scratchMem, "{}_ERASE".format(prefix))
+    arcpy.analysis.Erase(
+        in_features=xsLine,
+        erase_features=featExtent,
+        out_feature_class=eraseFeat,
+        cluster_tolerance=None
+    )
+    singleFeat = os.path.join(scratchMem, "{}_ERASE_SINGLE".format(prefix))
+    arcpy.management.MultipartToSinglepart(
+        in_features=eraseFeat,
+        out_feature_class=singleFeat
+    )
+    # Step 2: Get the extent of the lines to see if the profile has been offset...
+    profXMin, profXMax = xBounds(zm_line)
+    lineXMin, lineXMax = xBounds(xsLine)
+    with arcpy.da.SearchCursor(singleFeat, ["SHAPE@LENGTH", "SHAPE@"]) as cursor:
+        pieces = np.array([(length, shape.extent.XMin, shape.extent.XMax) for length, shape in cursor],
+                          dtype=np.float64).reshape(-1, 3)
+    # Step 3: Offset by the pieces outside the raster that touch the start of the line
+    if (cpDir == "Northwest" or cpDir == "Southwest"):
+        offset = profXMin > lineXMin
+        atStart = pieces[:, 1] == lineXMin
+    else:
+        offset = profXMax < lineXMax
+        atStart = pieces[:, 2] == lineXMax
+    moveLength = float(pieces[atStart, 0].sum()) if offset else 0
+    if moveLength:
+        arcpy.AddMessage("- Profile starts {} along the line".format(round(moveLength, 2)))
+    return zm_line, checkField, moveLength
+
+def buildConfidenceZone(inPoints, buffFC, unionFC, zoneFC, featExtent, fidExtent):
+    # Unions the borehole buffer with the raster extent and labels the pieces CONFIDENT or INFERRED
+    arcpy.analysis.Buffer(inPoints, buffFC, buff, "FULL", "ROUND", "ALL", None, "PLANAR")
+    arcpy.analysis.Union([featExtent, buffFC], unionFC, "ONLY_FID", None, "GAPS")
+    arcpy.management.CopyFeatures(unionFC, zoneFC)
+    # The memory workspace holds no domains, so the CONFIDENCE domain is only attached on disk
+    arcpy.management.AddField(
+        in_table=zoneFC,
+        field_name="CONFIDENCE",
+        field_type="TEXT",
+        field_length="255",
+        field_is_nullable="NULLABLE",
+        field_is_required="NON_REQUIRED",
+        field_domain=None if os.path.dirname(zoneFC) == scratchMem else "CONFIDENCE")
+    fidBuff = "FID_{}".format(limitString(os.path.splitext(os.path.basename(buffFC))[0], 60))
+    classifyConfidence(zoneFC, fidExtent, fidBuff)
+
+def segmentProfile(zoneFC, zoneName, Value, zm_line, checkField, profile, moveLength):
+    # Locates the confidence zones along the route and writes them to the profile in cross-section space
+    conEventsTable = os.path.join(scratchMem, "{}_polyEvents_{}".format(zoneName, Value))
+    conProps = "rkey LINE FromM ToM"
+    arcpy.lr.LocateFeaturesAlongRoutes(zoneFC, zm_line, checkField, "#", conEventsTable, conProps,
+                                       "FIRST", "NO_DISTANCE", "NO_ZERO")
+    # The events are written straight to the profile, which must keep the route's Z and M values
+    with arcpy.EnvManager(outputZFlag="Enabled", outputMFlag="Enabled"):
+        placeEvents(inRoutes=zm_line,
+                    idRteFld=checkField,
+                    eventTable=conEventsTable,
+                    eventRteFld="rkey",
+                    fromVar="FromM",
+                    toVar="ToM",
+                    eventLay=profile)
+    plan2side(ZMLines=profile, ve=ve, moveLength=moveLength)
+
+def confidenceClass(value, label, rgb, dashes=None):
+    # One renderer class: a 1 pt line in the given color, dashed when a dash template is given
+    stroke = arcpy.cim.CreateCIMObjectFromClassName("CIMSolidStroke", "V3")
+    stroke.enable = True
+    stroke.width = 1
+    stroke.capStyle = "Round"
+    stroke.joinStyle = "Round"
+    stroke.miterLimit = 10
+    stroke.color = arcpy.cim.CreateCIMObjectFromClassName("CIMRGBColor", "V3")
+    stroke.color.values = rgb
+    if dashes:
+        dash = arcpy.cim.CreateCIMObjectFromClassName("CIMGeometricEffectDashes", "V3")
+        dash.dashTemplate = dashes
+        dash.lineDashEnding = "NoConstraint"
+        stroke.effects = [dash]
+    symbol = arcpy.cim.CreateCIMObjectFromClassName("CIMLineSymbol", "V3")
+    symbol.symbolLayers = [stroke]
+    symbolRef = arcpy.cim.CreateCIMObjectFromClassName("CIMSymbolReference", "V3")
+    symbolRef.symbol = symbol
+    uniqueValue = arcpy.cim.CreateCIMObjectFromClassName("CIMUniqueValue", "V3")
+    uniqueValue.fieldValues = [value]
+    uvClass = arcpy.cim.CreateCIMObjectFromClassName("CIMUniqueValueClass", "V3")
+    uvClass.label = label
+    uvClass.values = [uniqueValue]
+    uvClass.symbol = symbolRef
+    uvClass.visible = True
+    return uvClass
+
+def confidenceRenderer(rgb):
+    # Unique value renderer on CONFIDENCE: solid where confident, dashed (6:6) where inferred
+    group = arcpy.cim.CreateCIMObjectFromClassName("CIMUniqueValueGroup", "V3")
+    group.heading = "Confidence of Profile"
+    group.classes = [confidenceClass("CONFIDENT", "Confident Surface", rgb),
+                     confidenceClass("INFERRED", "Inferred Surface", rgb, [6, 6])]
+    renderer = arcpy.cim.CreateCIMObjectFromClassName("CIMUniqueValueRenderer", "V3")
+    renderer.fields = ["CONFIDENCE"]
+    renderer.groups = [group]
+    renderer.useDefaultSymbol = False
+    return renderer
+
+def symbolizeProfile(layer, renderer):
+    # Replaces the layer's renderer with a single CIM read and write
+    cim = layer.getDefinition("V3")
+    cim.renderer = renderer
+    layer.setDefinition(cim)
 
 def limitString(string,limit):
     if len(string) > limit:
@@ -156,118 +316,70 @@ unknown = arcpy.SpatialReference(text=wkt)
 # Environment Variables
 arcpy.env.overwriteOutput = True
 arcpy.env.transferDomains = True
+# Profiles are added to their own XSEC map with addDataFromPath; nothing else should land in the active map
+arcpy.env.addOutputsToMap = False
+# The profiles reuse fixed scratch names in the memory workspace and write into the open project's maps, so
+# threads over XSEC would collide; RasterDomain, Buffer and Union can still use every core themselves
+arcpy.env.parallelProcessingFactor = "100%"
 prj = arcpy.mp.ArcGISProject("CURRENT")
 scratchDir = prj.defaultGeodatabase
-AddMsgAndPrint(msg="Scratch Geodatabase: {}".format(os.path.basename(scratchDir)),
+# Intermediates that are thrown away before the tool finishes are kept in memory
+scratchMem = "memory"
+# On-disk intermediates, removed together with a single Delete when the tool finishes
+scratchItems = set()
+xsecMaps = {m.name: m for m in prj.listMaps()}
+scratchName = os.path.basename(scratchDir)
+AddMsgAndPrint(msg="Scratch Geodatabase: {}".format(scratchName),
                severity=0)
 
 # Defining the list of cross-section names for the creation process
 allValue = unique_values(lineLayer, "XSEC")
 
-arcpy.AddMessage('_____________________________')
-arcpy.AddMessage("BEGIN BEDROCK SURFACE CREATION")
-if bdrkDEM == "":
-    AddMsgAndPrint("- No bedrock surface defined, passing to next step...")
-    pass
-else:
-    featExtent = os.path.join(scratchDir, "ProjectAreaExtent_BDRK")
-    testAndDelete(featExtent)
-    arcpy.ddd.RasterDomain(bdrkDEM, featExtent, "POLYGON")
-    for Value in allValue:
-        try:
-            arcpy.AddMessage("*Analyzing {}...*".format(Value))
-            arcpy.management.MakeFeatureLayer(lineLayer, "lineLayers")
-            arcpy.management.SelectLayerByAttribute("lineLayers", "NEW_SELECTION", "{}='{}'".format('XSEC', Value))
-
-            xs_name = "{}_{}".format(os.path.basename(lineLayer), Value)
-            tempFields = [f.name for f in arcpy.ListFields("lineLayers")]
-            checkField = "{}_ID".format(xs_name)
-            idField = next((f for f in tempFields if f == checkField), None)
-            idExists = fieldNone("lineLayers", checkField)
-
-            if idField is None or idExists == False:
-                idField = "ROUTEID"
-                arcpy.management.AddField("lineLayers", idField, "TEXT")
-                arcpy.management.CalculateField("lineLayers", checkField, "'01'", "PYTHON3")
-
-            desc = arcpy.da.Describe(lineLayer)
-            hasZ = desc["hasZ"]
-            hasM = desc["hasM"]
-
-            if hasZ and hasM:
-                zm_line = "lineLayers"
-                AddMsgAndPrint(
-                    "*Cross-section {} in {} already has M and Z values".format(Value, os.path.basename(lineLayer)))
-            else:
-                # Add z values
-                z_line = os.path.join(scratchDir, "XSEC_{}_z".format(Value))
-                arcpy.ddd.InterpolateShape(bdrkDEM, "lineLayers", z_line)
-                arcpy.management.AddField(z_line, "QUAD", "TEXT", "", "", "255", "", "NULLABLE")
-                with arcpy.da.UpdateCursor(z_line, ["DIRECTION", "QUAD"]) as cursor:
-                    for row in cursor:
-                        if (row[0] == "W-E" or row[0] == "NW-SE" or row[0] == "E-W"):
-                            quad = "Northwest"
-                            row[1] = quad
-                            arcpy.AddMessage("- Analyzing from NW quad")
-                        if (row[0] == "SW-NE" or row[0] == "S-N" or row[0] == "N-S"):
-                            quad = "Southwest"
-                            row[1] = quad
-                            arcpy.AddMessage("- Analyzing from SW quad")
-                        if row[0] == "NE-SW":
-                            quad = "Northeast"
-                            row[1] = quad
-                            arcpy.AddMessage("- Analyzing from NE quad")
-                        if row[0] == "SE-NW":
-                            quad = "Southeast"
-                            row[1] = quad
-                            arcpy.AddMessage("- Analyzing from SE quad")
-                        else:
-                            pass
-                        cursor.updateRow(row)
-                del row, cursor
-                cpDir = arcpy.SearchCursor(z_line, "", "", "", "QUAD D").next().getValue("QUAD")
-                cp = getCPValue(cpDir)
-                zm_line = os.path.join(scratchDir, "XSEC_{}_zm".format(Value))
-                arcpy.lr.CreateRoutes(z_line, checkField, zm_line, "LENGTH", "#", "#", cp)
-
-                # Now we need to determine if the profile starts after the beginning of the line.
-                # Step 1: Erase the temporary feature layer to exclude the area inside the raster area...
-                eraseFeat = os.path.join(scratchDir,"BDRK_ERASE")
-                testAndDelete(eraseFeat)
-                arcpy.analysis.Erase(
-                    in_features="lineLayers",
-                    erase_features=featExtent,
-                    out_feature_class=eraseFeat,
-                    cluster_tolerance=None
-                )
-                singleFeat = os.path.join(scratchDir,"BDRK_ERASE_SINGLE")
-                testAndDelete(singleFeat)
-                arcpy.management.MultipartToSinglepart(
-                    in_features=eraseFeat,
-                    out_feature_class=singleFeat
-                )
-                # Step 2: Get the extent of the lines to see if the profile has been offset...
-                profileAlign = arcpy.Describe(zm_line)
-                mainLineAlign = arcpy.Describe("lineLayers")
-                geometries = arcpy.management.CopyFeatures(singleFeat,arcpy.Geometry())
-                moveLength = 0
-                for geometry in geometries:
-                    if (cpDir == "Northwest" or cpDir == "Southwest"):
-                        if (profileAlign.extent.XMin > mainLineAlign.extent.XMin and geometry.extent.XMin == mainLineAlign.extent.XMin):
-                            moveLength += float(geometry.length)
-                            AddMsgAndPrint(moveLength)
-                        else:
-                            pass
-                    else:
-                        AddMsgAndPrint(cpDir)
-                        if (profileAlign.extent.XMax < mainLineAlign.extent.XMax and geometry.extent.XMax == mainLineAlign.extent.XMax):
-                            moveLength += float(geometry.length)
-                            AddMsgAndPrint(moveLength)
-                        else:
-                            pass
-        except:
-            AddMsgAndPrint("ERROR 009: Failed to create bedrock surface for {}".format(Value), 2)
-            raise SystemError
+# The line layer's name, fields and Z/M properties are shared by every cross-section
+lineName = os.path.basename(lineLayer)
+lineFields = {f.name for f in arcpy.ListFields(lineLayer)}
+desc = arcpy.da.Describe(lineLayer)
+hasZ = desc["hasZ"]
+hasM = desc["hasM"]
+bhName = os.path.basename(bhPoints)
+# Linear unit strings are "<value> <unit>"; a bare value has no unit
+buffValue, buffUnit = (buff.split() + [""])[:2]
+
+# Split the cross-section lines into one feature class per XSEC so each section can be used directly
+splitGDB = os.path.join(arcpy.env.scratchFolder, "XSEC_Lines.gdb")
+testAndDelete(splitGDB)
+arcpy.management.CreateFileGDB(os.path.dirname(splitGDB), os.path.basename(splitGDB))
+# The split lines and scratch intermediates are removed even if a profile fails
+try:
+    arcpy.analysis.SplitByAttributes(lineLayer, splitGDB, ["XSEC"])
+    xsecLines = {}
+    with arcpy.EnvManager(workspace=splitGDB):
+        for fc in arcpy.ListFeatureClasses():
+            xsLine = os.path.join(splitGDB, fc)
+            with arcpy.da.SearchCursor(xsLine, ["XSEC"]) as cursor:
+                xsecLines[next(cursor)[0]] = xsLine
+            # Fixed route ID on the scratch copy, so the source lines are never edited
+            if "ROUTEID" not in lineFields:
+                arcpy.management.AddField(xsLine, "ROUTEID", "TEXT")
+            arcpy.management.CalculateField(xsLine, "ROUTEID", "'01'", "PYTHON3")
+    # Every cross-section needs its own split line before any profile is built
+    missingLines = [Value for Value in allValue if Value not in xsecLines]
+    if missingLines:
+        AddMsgAndPrint("ERROR 008: No split lines for cross-section(s) {}".format(", ".join(map(str, missingLines))), 2)
+        raise SystemError
+
+    arcpy.AddMessage('_____________________________')
+    arcpy.AddMessage("BEGIN BEDROCK SURFACE CREATION")
+    if bdrkDEM == "":
+        AddMsgAndPrint("- No bedrock surface defined, passing to next step...")
+        pass
+    else:
+        featExtent = os.path.join(scratchMem, "ProjectAreaExtent_BDRK")
+        arcpy.ddd.RasterDomain(bdrkDEM, featExtent, "POLYGON")
+        fidExtent = "FID_{}".format(limitString(os.path.basename(featExtent),60))
+        # Every bedrock profile gets the same black confidence renderer
+        bdrkRenderer = confidenceRenderer([0, 0, 0, 100])
+        # The confidence zone depends only on the raster and the boreholes, so it is shared by every cross-section
         try:
             AddMsgAndPrint("    Creating the confidence zone polygon feature class...")
             bdrkpoints = arcpy.management.SelectLayerByAttribute(
@@ -275,361 +387,112 @@ else:
                 selection_type="NEW_SELECTION",
                 where_clause="DEPTH_2_BDRK > 0",
                 invert_where_clause=None)
-            bdrkBuff = os.path.join(scratchDir,"XSEC_{}_BUFF_BDRK_{}{}".format(Value,buff.split(" ")[0],buff.split(" ")[1]))
-            arcpy.analysis.Buffer(bdrkpoints, bdrkBuff, buff, "FULL", "ROUND", "ALL", None, "PLANAR")
-
-            arcpy.management.CreateFeatureclass(scratchDir, "ProjectAreaExtent", "POLYGON")
-
-            unionBDRK = os.path.join(scratchDir, "XSEC_{}_UNION_BDRK".format(Value))
-            inFeatures = [featExtent, bdrkBuff]
-            arcpy.analysis.Union(inFeatures, unionBDRK, "ONLY_FID", None, "GAPS")
-            bdrkConfidence = os.path.join(os.path.dirname(bhPoints), "XSEC_{}_BDRK_ConZone".format(Value))
-            arcpy.management.CopyFeatures(unionBDRK,bdrkConfidence)
-            arcpy.management.AddField(
-                in_table=bdrkConfidence,
-                field_name="CONFIDENCE",
-                field_type="TEXT",
-                field_length="255",
-                field_is_nullable="NULLABLE",
-                field_is_required="NON_REQUIRED",
-                field_domain="CONFIDENCE")
-            with arcpy.da.UpdateCursor(bdrkConfidence, ["FID_{}".format(limitString(os.path.basename(featExtent),60)),
-                                                        "FID_{}".format(limitString(os.path.basename(bdrkBuff),60)),
-                                                        "CONFIDENCE"]) as cursor:
-                for row in cursor:
-                    if row[0] == -1:
-                        cursor.deleteRow()
-                    if (row[0] == 1 and row[1] == -1):
-                        row[2] = "INFERRED"
-                        cursor.updateRow(row)
-                    if (row[0] == 1 and row[1] == 1):
-                        row[2] = "CONFIDENT"
-                        cursor.updateRow(row)
-                del row, cursor
-        except:
-            AddMsgAndPrint("ERROR 010: Failed to create confidence zone for {}".format(os.path.basename(bdrkDEM)),2)
-            raise SystemError
-        try:
-            AddMsgAndPrint("    Create segmented profile for bedrock profile...")
-            conEventsTable = os.path.join(scratchDir, "{}_polyEvents_{}".format(os.path.basename(bdrkConfidence),Value))
-            testAndDelete(conEventsTable)
-            conProps = "rkey LINE FromM ToM"
-            arcpy.lr.LocateFeaturesAlongRoutes(bdrkConfidence, zm_line, checkField, "#", conEventsTable, conProps,
-                                               "FIRST", "NO_DISTANCE", "NO_ZERO")
-            locatedEvents_bdrk = os.path.join(scratchDir, "{}_located_{}".format(os.path.basename(bdrkConfidence),Value))
-            conEvent_sort = os.path.join(scratchDir,
-                                         "{}_polyEvents_{}_sorted".format(os.path.basename(bdrkConfidence), Value))
-            arcpy.management.Sort(in_dataset=conEventsTable, out_dataset=conEvent_sort,
-                                  sort_field=[["FromM", "ASCENDING"]])
-            placeEvents(inRoutes=zm_line,
-                        idRteFld=checkField,
-                        eventTable=conEvent_sort,
-                        eventRteFld="rkey",
-                        fromVar="FromM",
-                        toVar="ToM",
-                        eventLay=locatedEvents_bdrk)
-
-            bdrkProfile = os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)), "XSEC_{}_BDRK_{}x".format(Value, ve))
-            arcpy.management.CreateFeatureclass(os.path.join(outGDB,"XSEC_{}".format(Value)),
-                                                os.path.basename(bdrkProfile), "POLYLINE", locatedEvents_bdrk,
-                                                "ENABLED", "ENABLED")
-            arcpy.management.Append(locatedEvents_bdrk, bdrkProfile, "NO_TEST")
-            plan2side(ZMLines=bdrkProfile, ve=ve)
-        except:
-            AddMsgAndPrint("ERROR 011: Failed to segment the bedrock profile.",2)
-            raise SystemError
-        try:
-            AddMsgAndPrint("    Cleaning {}...".format(os.path.basename(scratchDir)))
-            xsecMap = prj.listMaps('XSEC_{}'.format(Value))[0]
-            xsecMap.addDataFromPath(bdrkProfile)
-            arcpy.management.SelectLayerByAttribute("lineLayers", "CLEAR_SELECTION")
+            bdrkBuff = os.path.join(scratchMem,"BUFF_BDRK_{}{}".format(buffValue,buffUnit))
+            unionBDRK = os.path.join(scratchMem, "UNION_BDRK")
+            bdrkConName = "BDRK_ConZone"
+            bdrkConfidence = os.path.join(scratchMem, bdrkConName)
+            buildConfidenceZone(bdrkpoints, bdrkBuff, unionBDRK, bdrkConfidence, featExtent, fidExtent)
             arcpy.management.SelectLayerByAttribute(bhPoints, "CLEAR_SELECTION")
-            arcpy.management.Delete([bdrkBuff,unionBDRK,eraseFeat,singleFeat,bdrkConfidence])
-            arcpy.management.DeleteField(lineLayer,checkField)
-
-            bdrkLayer = xsecMap.listLayers(os.path.splitext(os.path.basename(bdrkProfile))[0])[0]
-
-            # Grids symbology...
-            symBDRK = bdrkLayer.symbology
-            symBDRK.updateRenderer("UniqueValueRenderer")
-            bdrkLayer.symbology = symBDRK
-
-            symBDRK.renderer.fields = ["CONFIDENCE"]
-            symBDRK.renderer.removeValues({"CONFIDENCE": ["CONFIDENT", "INFERRED"]})
-            bdrkLayer.symbology = symBDRK
-            symBDRK.renderer.addValues({"Confidence of Profile": ["CONFIDENT", "INFERRED"]})
-            bdrkLayer.symbology = symBDRK
-            for group in symBDRK.renderer.groups:
-                for item in group.items:
-                    if item.values[0][0] == "CONFIDENT":
-                        item.symbol.outlineColor = {'RGB': [0, 0, 0, 100]}
-                        item.symbol.outlineWidth = 1
-                        item.label = "Confident Surface"
-                        bdrkLayer.symbology = symBDRK
-                    elif item.values[0][0] == "INFERRED":
-                        item.symbol.applySymbolFromGallery('Dashed 6:6')
-                        item.symbol.outlineColor = {'RGB': [0, 0, 0, 100]}
-                        item.symbol.outlineWidth = 1
-                        item.label = "Inferred Surface"
-                        bdrkLayer.symbology = symBDRK
-            prj.save()
         except:
-            AddMsgAndPrint("ERROR 012: Failed to clean up {}".format(os.path.basename(scratchDir)), 2)
+            AddMsgAndPrint("ERROR 010: Failed to create confidence zone for {}".format(os.path.basename(bdrkDEM)),2)
+            AddMsgAndPrint(traceback.format_exc(), 2)
             raise SystemError
+        for Value in allValue:
+            # A single handler covers the whole profile; phase names the step that failed
+            phase = "route"
+            try:
+                arcpy.AddMessage("*Analyzing {}...*".format(Value))
+                zm_line, checkField, moveLength = profileRoute(bdrkDEM, Value, featExtent, "BDRK")
+
+                phase = "segment"
+                AddMsgAndPrint("    Create segmented profile for bedrock profile...")
+                xsecDir = os.path.join(outGDB, "XSEC_{}".format(Value))
+                bdrkProfile = os.path.join(xsecDir, "XSEC_{}_BDRK_{}x".format(Value, ve))
+                segmentProfile(bdrkConfidence, bdrkConName, Value, zm_line, checkField, bdrkProfile, moveLength)
+
+                phase = "cleanup"
+                AddMsgAndPrint("    Cleaning {}...".format(scratchName))
+                bdrkLayer = xsecMaps['XSEC_{}'.format(Value)].addDataFromPath(bdrkProfile)
+
+                # Confidence symbology...
+                symbolizeProfile(bdrkLayer, bdrkRenderer)
+            except:
+                AddMsgAndPrint(BDRK_ERRORS[phase].format(Value=Value, scratch=scratchName), 2)
+                AddMsgAndPrint(traceback.format_exc(), 2)
+                raise SystemError
+        prj.save()
 
-arcpy.AddMessage('_____________________________')
-arcpy.AddMessage("BEGIN GROUNDWATER SURFACE CREATION")
-if gwlDEM == "":
-    AddMsgAndPrint("- Groundwater rasters not defined. Passing to grid creation...")
-    pass
-else:
-    for Value in allValue:
+    arcpy.AddMessage('_____________________________')
+    arcpy.AddMessage("BEGIN GROUNDWATER SURFACE CREATION")
+    if gwlDEM.rowCount == 0:
+        AddMsgAndPrint("- Groundwater rasters not defined. Passing to grid creation...")
+        pass
+    else:
+        # Every groundwater profile starts with the same blue confidence renderer
+        gwlRenderer = confidenceRenderer([0, 197, 255, 100])
         for i in range(0, gwlDEM.rowCount):
             raster = gwlDEM.getValue(i, 0)
             startYear = gwlDEM.getValue(i, 1)
             endYear = gwlDEM.getValue(i, 2)
-
-            featExtent = os.path.join(scratchDir, "ProjectAreaExtent_{}".format(os.path.splitext(os.path.basename(raster))[0]))
-            testAndDelete(featExtent)
+            allYears = startYear == "All Years" or endYear == "All Years" or (startYear == "" and endYear == "")
+            yearSuffix = "AllYears" if allYears else "{}_{}".format(startYear, endYear)
+
+            # The raster extent and confidence zone do not depend on the cross-section, so build them once per raster
+            rasterName = os.path.basename(raster)
+            extentName = "ProjectAreaExtent_{}".format(os.path.splitext(rasterName)[0])
+            featExtent = os.path.join(scratchMem, extentName)
+            fidExtent = "FID_{}".format(limitString(extentName,60))
+            conZoneName = rasterName + "_CONFIDENCE_ZONE"
             arcpy.ddd.RasterDomain(raster, featExtent, "POLYGON")
             try:
-                arcpy.AddMessage("*Analyzing {} for {}...*".format(raster, Value))
-                arcpy.management.MakeFeatureLayer(lineLayer, "lineLayers")
-                arcpy.management.SelectLayerByAttribute("lineLayers", "NEW_SELECTION", "{}='{}'".format('XSEC', Value))
-
-                xs_name = "{}_{}".format(os.path.basename(lineLayer), Value)
-                tempFields = [f.name for f in arcpy.ListFields("lineLayers")]
-                checkField = "{}_ID".format(xs_name)
-                idField = next((f for f in tempFields if f == checkField), None)
-                idExists = fieldNone("lineLayers", checkField)
-
-                if idField is None or idExists == False:
-                    idField = "ROUTEID"
-                    arcpy.management.AddField("lineLayers", idField, "TEXT")
-                    arcpy.management.CalculateField("lineLayers", checkField, "'01'", "PYTHON3")
-
-                desc = arcpy.da.Describe(lineLayer)
-                hasZ = desc["hasZ"]
-                hasM = desc["hasM"]
-
-                if hasZ and hasM:
-                    zm_line = "lineLayers"
-                    AddMsgAndPrint(
-                        "*Cross-section {} in {} already has M and Z values".format(Value, os.path.basename(lineLayer)))
+                AddMsgAndPrint("    Creating the confidence zone polygon feature class for {}...".format(rasterName))
+                if allYears:
+                    buffPoints = bhPoints
+                    buffWW = os.path.join(scratchMem, bhName + "_{}{}_buff_AllYears".format(buffValue,buffUnit))
                 else:
-                    # Add z values
-                    z_line = os.path.join(scratchDir, "XSEC_{}_z".format(Value))
-                    arcpy.ddd.InterpolateShape(raster, "lineLayers", z_line)
-                    arcpy.management.AddField(z_line, "QUAD", "TEXT", "", "", "255", "", "NULLABLE")
-                    with arcpy.da.UpdateCursor(z_line, ["DIRECTION", "QUAD"]) as cursor:
-                        for row in cursor:
-                            if (row[0] == "W-E" or row[0] == "NW-SE" or row[0] == "E-W"):
-                                quad = "Northwest"
-                                row[1] = quad
-                                arcpy.AddMessage("- Analyzing from NW quad")
-                            if (row[0] == "SW-NE" or row[0] == "S-N" or row[0] == "N-S"):
-                                quad = "Southwest"
-                                row[1] = quad
-                                arcpy.AddMessage("- Analyzing from SW quad")
-                            if row[0] == "NE-SW":
-                                quad = "Northeast"
-                                row[1] = quad
-                                arcpy.AddMessage("- Analyzing from NE quad")
-                            if row[0] == "SE-NW":
-                                quad = "Southeast"
-                                row[1] = quad
-                                arcpy.AddMessage("- Analyzing from SE quad")
-                            else:
-                                pass
-                            cursor.updateRow(row)
-                        del row
-                        del cursor
-                    cpDir = arcpy.SearchCursor(z_line, "", "", "", "QUAD D").next().getValue("QUAD")
-                    cp = getCPValue(cpDir)
-                    zm_line = os.path.join(scratchDir, "XSEC_{}_zm".format(Value))
-                    arcpy.lr.CreateRoutes(z_line, checkField, zm_line, "LENGTH", "#", "#", cp)
-
-                    # Now we need to determine if the profile starts after the beginning of the line.
-                    # Step 1: Erase the temporary feature layer to exclude the area inside the raster area...
-                    eraseFeat = os.path.join(scratchDir, "GWL_ERASE")
-                    testAndDelete(eraseFeat)
-                    arcpy.analysis.Erase(
-                        in_features="lineLayers",
-                        erase_features=featExtent,
-                        out_feature_class=eraseFeat,
-                        cluster_tolerance=None
-                    )
-                    singleFeat = os.path.join(scratchDir, "GWL_ERASE_SINGLE")
-                    testAndDelete(singleFeat)
-                    arcpy.management.MultipartToSinglepart(
-                        in_features=eraseFeat,
-                        out_feature_class=singleFeat
-                    )
-                    # Step 2: Get the extent of the lines to see if the profile has been offset...
-                    profileAlign = arcpy.Describe(zm_line)
-                    mainLineAlign = arcpy.Describe("lineLayers")
-                    geometries = arcpy.management.CopyFeatures(singleFeat, arcpy.Geometry())
-                    moveLength = 0
-                    for geometry in geometries:
-                        if (cpDir == "Northwest" or cpDir == "Southwest"):
-                            if (profileAlign.extent.XMin > mainLineAlign.extent.XMin or geometry.extent.XMin == mainLineAlign.extent.XMin):
-                                moveLength += float(geometry.length)
-                            else:
-                                pass
-                        else:
-                            AddMsgAndPrint(cpDir)
-                            if (profileAlign.extent.XMax < mainLineAlign.extent.XMax or geometry.extent.XMax == mainLineAlign.extent.XMax):
-                                moveLength += float(geometry.length)
-                            else:
-                                pass
-            except:
-                AddMsgAndPrint("ERROR 013: Failed to create {} for XSEC {}".format(raster, Value), 2)
-                raise SystemError
-
-            try:
-                if (startYear == "All Years" or endYear == "All Years" or (startYear == "" and endYear == "")):
-                    AddMsgAndPrint("    Creating the confidence zone polygon feature class...")
-                    buffWW = os.path.basename(bhPoints) + "_{}{}_buff_AllYears".format(buff.split(" ")[0],buff.split(" ")[1])
-                    arcpy.analysis.Buffer(bhPoints, buffWW, "{}".format(buff), "FULL", "ROUND", "ALL", None, "PLANAR")
-                    unionWW = os.path.basename(bhPoints) + "_Union"
-                    inFeatures = [featExtent, buffWW]
-                    arcpy.analysis.Union(inFeatures, unionWW, 'ONLY_FID', None, 'GAPS')
-                    confidenceZone = os.path.join(scratchDir, os.path.basename(raster) + "_CONFIDENCE_ZONE")
-                    arcpy.management.CopyFeatures(unionWW, confidenceZone)
-                    arcpy.management.SelectLayerByAttribute(unionWW, "CLEAR_SELECTION")
-                    arcpy.management.AddField(
-                        in_table=confidenceZone,
-                        field_name="CONFIDENCE",
-                        field_type="TEXT",
-                        field_length="255",
-                        field_is_nullable="NULLABLE",
-                        field_is_required="NON_REQUIRED",
-                        field_domain="CONFIDENCE")
-                    with arcpy.da.UpdateCursor(confidenceZone,
-                                               ["FID_{}".format(limitString(os.path.splitext(os.path.basename(featExtent))[0],60)),
-                                                "FID_{}".format(limitString(os.path.splitext(os.path.basename(buffWW))[0],60)),
-                                                "CONFIDENCE"]) as cursor:
-                        for row in cursor:
-                            if row[0] == -1:
-                                cursor.deleteRow()
-                            if (row[0] == 1 and row[1] == -1):
-                                row[2] = "INFERRED"
-                                cursor.updateRow(row)
-                            if (row[0] == 1 and row[1] == 1):
-                                row[2] = "CONFIDENT"
-                                cursor.updateRow(row)
-                        del row, cursor
-
-                else:
-                    AddMsgAndPrint("    Creating the confidence zone polygon feature class...")
-                    yearRangeRaster = arcpy.management.SelectLayerByAttribute(
+                    buffPoints = arcpy.management.SelectLayerByAttribute(
                         in_layer_or_view=bhPoints,
                         selection_type="NEW_SELECTION",
                         where_clause="CONST_DATE >= timestamp '{}-01-01 00:00:00' And CONST_DATE <= timestamp '{}-12-31 00:00:00'".format(startYear,endYear),
                         invert_where_clause=None)
-                    buffWW = os.path.basename(bhPoints) + "_{}{}_buff_{}_{}".format(buff.split(" ")[0],
-                                                                                   buff.split(" ")[1],
-                                                                                    startYear,
-                                                                                    endYear)
-                    arcpy.analysis.Buffer(yearRangeRaster, buffWW, "{}".format(buff), "FULL", "ROUND", "ALL", None,
-                                          "PLANAR")
-                    unionWW = os.path.basename(bhPoints) + "_Union"
-                    inFeatures = [featExtent, buffWW]
-                    arcpy.analysis.Union(inFeatures, unionWW, 'ONLY_FID', None, 'GAPS')
-                    confidenceZone = os.path.join(scratchDir, os.path.basename(raster) + "_CONFIDENCE_ZONE")
-                    arcpy.management.CopyFeatures(unionWW, confidenceZone)
-                    arcpy.management.SelectLayerByAttribute(unionWW, "CLEAR_SELECTION")
-                    arcpy.management.AddField(
-                        in_table=confidenceZone,
-                        field_name="CONFIDENCE",
-                        field_type="TEXT",
-                        field_length="255",
-                        field_is_nullable="NULLABLE",
-                        field_is_required="NON_REQUIRED",
-                        field_domain="CONFIDENCE")
-                    with arcpy.da.UpdateCursor(confidenceZone,
-                                               ["FID_{}".format(limitString(os.path.splitext(os.path.basename(featExtent))[0],60)),
-                                                "FID_{}".format(limitString(os.path.splitext(os.path.basename(buffWW))[0],60)),
-                                                "CONFIDENCE"]) as cursor:
-                        for row in cursor:
-                            if row[0] == -1:
-                                cursor.deleteRow()
-                            if (row[0] == 1 and row[1] == -1):
-                                row[2] = "INFERRED"
-                                cursor.updateRow(row)
-                            if (row[0] == 1 and row[1] == 1):
-                                row[2] = "CONFIDENT"
-                                cursor.updateRow(row)
-                        del row, cursor
+                    buffWW = os.path.join(scratchMem, bhName + "_{}{}_buff_{}_{}".format(buffValue, buffUnit, startYear, endYear))
+                unionWW = os.path.join(scratchMem, bhName + "_Union")
+                confidenceZone = os.path.join(scratchDir, conZoneName)
+                buildConfidenceZone(buffPoints, buffWW, unionWW, confidenceZone, featExtent, fidExtent)
+                scratchItems.add(confidenceZone)
+                # Only the year range selects boreholes, so All Years has nothing to clear
+                if not allYears:
+                    arcpy.management.SelectLayerByAttribute(bhPoints, "CLEAR_SELECTION")
             except:
-                AddMsgAndPrint("ERROR 014: Failed to create confidence zone for {}".format(os.path.basename(raster)),
+                AddMsgAndPrint("ERROR 014: Failed to create confidence zone for {}".format(rasterName),
                                2)
-                raise SystemError
-            try:
-                AddMsgAndPrint("    Create segmented profile for {} profile...".format(os.path.basename(raster)))
-                conEventsTable = os.path.join(scratchDir,
-                                              "{}_polyEvents_{}".format(os.path.basename(confidenceZone), Value))
-                conProps = "rkey LINE FromM ToM"
-                arcpy.lr.LocateFeaturesAlongRoutes(confidenceZone, zm_line, checkField, "#", conEventsTable, conProps,
-                                                   "FIRST", "NO_DISTANCE", "NO_ZERO")
-                locatedEvents_gwl = os.path.join(scratchDir,
-                                                  "{}_located_{}".format(os.path.basename(confidenceZone), Value))
-                placeEvents(inRoutes=zm_line,
-                            idRteFld=checkField,
-                            eventTable=conEventsTable,
-                            eventRteFld="rkey",
-                            fromVar="FromM",
-                            toVar="ToM",
-                            eventLay=locatedEvents_gwl)
-                if (startYear == "All Years" or endYear == "All Years" or (startYear == "" and endYear == "")):
-                    gwlProfile = os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)), "XSEC_{}_GWL_AllYears_{}x".format(Value, ve))
-                else:
-                    gwlProfile = os.path.join(os.path.join(outGDB,"XSEC_{}".format(Value)), "XSEC_{}_GWL_{}_{}_{}x".format(Value,startYear,endYear, ve))
-                arcpy.management.CreateFeatureclass(os.path.join(outGDB, "XSEC_{}".format(Value)),
-                                                    os.path.basename(gwlProfile), "POLYLINE", locatedEvents_gwl,
-                                                    "ENABLED", "ENABLED")
-                arcpy.management.Append(locatedEvents_gwl, gwlProfile, "NO_TEST")
-                plan2side(ZMLines=gwlProfile, ve=ve)
-            except:
-                AddMsgAndPrint("ERROR 015: Failed to segment the groundwater profile.", 2)
+                AddMsgAndPrint(traceback.format_exc(), 2)
                 raise SystemError
 
-            try:
-                AddMsgAndPrint("    Cleaning {}...".format(os.path.basename(scratchDir)))
-                xsecMap = prj.listMaps('XSEC_{}'.format(Value))[0]
-                xsecMap.addDataFromPath(gwlProfile)
-                arcpy.management.SelectLayerByAttribute("lineLayers", "CLEAR_SELECTION")
-                arcpy.management.SelectLayerByAttribute(bhPoints, "CLEAR_SELECTION")
-                arcpy.management.Delete([zm_line,buffWW,unionWW,confidenceZone,singleFeat,eraseFeat])
-                arcpy.management.DeleteField(lineLayer, checkField)
-
-                gwlLayer = xsecMap.listLayers(os.path.splitext(os.path.basename(gwlProfile))[0])[0]
-
-                # Grids symbology...
-                symGWL = gwlLayer.symbology
-                symGWL.updateRenderer("UniqueValueRenderer")
-                gwlLayer.symbology = symGWL
-
-                symGWL.renderer.fields = ["CONFIDENCE"]
-                symGWL.renderer.removeValues({"CONFIDENCE": ["CONFIDENT", "INFERRED"]})
-                gwlLayer.symbology = symGWL
-                symGWL.renderer.addValues({"Confidence of Profile": ["CONFIDENT", "INFERRED"]})
-                gwlLayer.symbology = symGWL
-                for group in symGWL.renderer.groups:
-                    for item in group.items:
-                        if item.values[0][0] == "CONFIDENT":
-                            item.symbol.outlineColor = {'RGB': [0, 197, 255, 100]}
-                            item.symbol.outlineWidth = 1
-                            item.label = "Confident Surface"
-                            gwlLayer.symbology = symGWL
-                        elif item.values[0][0] == "INFERRED":
-                            item.symbol.applySymbolFromGallery('Dashed 6:6')
-                            item.symbol.outlineColor = {'RGB': [0, 197, 255, 100]}
-                            item.symbol.outlineWidth = 1
-                            item.label = "Inferred Surface"
-                            gwlLayer.symbology = symGWL
-                prj.save()
-                AddMsgAndPrint("PLease make sure to change color symbology for different groundwater intervals.")
-            except:
-                AddMsgAndPrint("ERROR 016: Failed to clean up {}".format(os.path.basename(scratchDir)), 2)
-                raise SystemError
\ No newline at end of file
+            for Value in allValue:
+                # A single handler covers the whole profile; phase names the step that failed
+                phase = "route"
+                try:
+                    arcpy.AddMessage("*Analyzing {} for {}...*".format(raster, Value))
+                    zm_line, checkField, moveLength = profileRoute(raster, Value, featExtent, "GWL")
+
+                    phase = "segment"
+                    AddMsgAndPrint("    Create segmented profile for {} profile...".format(rasterName))
+                    xsecDir = os.path.join(outGDB, "XSEC_{}".format(Value))
+                    gwlProfile = os.path.join(xsecDir, "XSEC_{}_GWL_{}_{}x".format(Value, yearSuffix, ve))
+                    segmentProfile(confidenceZone, conZoneName, Value, zm_line, checkField, gwlProfile, moveLength)
+
+                    phase = "cleanup"
+                    AddMsgAndPrint("    Cleaning {}...".format(scratchName))
+                    gwlLayer = xsecMaps['XSEC_{}'.format(Value)].addDataFromPath(gwlProfile)
+
+                    # Confidence symbology...
+                    symbolizeProfile(gwlLayer, gwlRenderer)
+                except:
+                    AddMsgAndPrint(GWL_ERRORS[phase].format(raster=raster, Value=Value, scratch=scratchName), 2)
+                    AddMsgAndPrint(traceback.format_exc(), 2)
+                    raise SystemError
+        prj.save()
+        AddMsgAndPrint("Please make sure to change color symbology for different groundwater intervals.")
+finally:
+    arcpy.management.Delete(list(scratchItems) + [splitGDB, scratchMem])